@@ -0,0 +1,69 @@
+"""Cold-start time and peak memory of importing the API for each model backend.
+
+Each measurement runs in a fresh interpreter, as a new uvicorn worker would.
+
+    python -m benchmarks.bench_coldstart --repeats 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.common import write_results
+
+# Runs in the child interpreter and reports its own import time and peak RSS.
+# VmHWM is preferred because ru_maxrss on Linux also counts the parent's
+# memory from before exec, which would hide the difference between backends.
+CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+import src.app
+elapsed = time.perf_counter() - started
+try:
+    with open("/proc/self/status") as f:
+        peak_kb = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+except (OSError, StopIteration):
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "import_seconds": elapsed,
+    "max_rss_mb": peak_kb / 1024,
+    "tensorflow_imported": "tensorflow" in sys.modules,
+}))
+"""
+
+def cold_start(backend):
+    env = {**os.environ, "MODEL_BACKEND": backend, "TF_CPP_MIN_LOG_LEVEL": "3"}
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, check=True
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_seconds"] = time.perf_counter() - started
+    return result
+
+def run(backends=("keras", "numpy"), repeats=3):
+    results = {}
+    for backend in backends:
+        runs = [cold_start(backend) for _ in range(repeats)]
+        results[backend] = {
+            "runs": runs,
+            "median_import_seconds": float(np.median([r["import_seconds"] for r in runs])),
+            "median_process_seconds": float(np.median([r["process_seconds"] for r in runs])),
+            "max_rss_mb": float(max(r["max_rss_mb"] for r in runs)),
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["keras", "numpy"])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default="benchmarks/results/coldstart.json")
+    args = parser.parse_args()
+    write_results({"cold_start": run(args.backends, args.repeats)}, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Inference throughput of each model backend at batch sizes 1-10k.
+
+    python -m benchmarks.bench_inference --backends numpy random_forest
+"""
+import argparse
+import os
+
+import numpy as np
+
+from src.model import IrrigationModel
+from src.preprocessing import IrrigationPreprocessor
+from benchmarks.common import BATCH_SIZES, throughput, write_results
+from benchmarks.synthetic import make_dataset, prediction_inputs
+
+# random_forest is the flattened forest the API serves; random_forest_sklearn
+# is the same forest through sklearn's predict + predict_proba, for comparison
+BACKENDS = ["keras", "numpy", "random_forest", "random_forest_sklearn"]
+
+def keras_scorer(model_path):
+    import joblib
+
+    model_data = joblib.load(model_path)
+    model, scaler = model_data['model'], model_data['scaler']
+    return lambda X: model.predict_on_batch(scaler.transform(X[:, :3]))
+
+def numpy_scorer(npz_path):
+    from src.numpy_engine import NumpyModel
+
+    engine = NumpyModel.load(npz_path)
+    return lambda X: engine.predict_proba(X[:, :3])
+
+def random_forest_scorer(df, flat=True):
+    """IrrigationModel fitted on synthetic data, scored the way IrrigationPredictionService does"""
+    preprocessor = IrrigationPreprocessor()
+    X, y = preprocessor.preprocess_data(df.copy())
+    model = IrrigationModel()
+    model.train(X.to_numpy(), y)
+    inputs = prediction_inputs(df)
+    encoded, _ = preprocessor.prepare_batch(inputs)
+
+    if flat:
+        forest = model.compile_forest()
+        return lambda X: forest.predict(encoded[:len(X)])
+
+    def score(X):
+        rows = encoded[:len(X)]
+        model.predict(rows)
+        return model.predict_proba(rows)
+    return score
+
+def run(backends=BACKENDS, batch_sizes=BATCH_SIZES, min_time=0.5,
+        model_path="models/cropmodel.pkl", npz_path="models/cropmodel.npz"):
+    df = make_dataset(max(max(batch_sizes), 2000))
+    X = df[['MOI', 'temp', 'humidity']].to_numpy(dtype=np.float64)
+
+    results = {}
+    for backend in backends:
+        if backend == "keras":
+            score = keras_scorer(model_path)
+        elif backend == "numpy":
+            if not os.path.exists(npz_path):
+                print(f"Skipping numpy backend: {npz_path} not found")
+                continue
+            score = numpy_scorer(npz_path)
+        elif backend in ("random_forest", "random_forest_sklearn"):
+            score = random_forest_scorer(df, flat=backend == "random_forest")
+        else:
+            raise ValueError(f"Unknown backend {backend!r}")
+        results[backend] = [
+            throughput(lambda: score(X[:batch_size]), batch_size, min_time=min_time)
+            for batch_size in batch_sizes
+        ]
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=BATCH_SIZES)
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds to run each measurement")
+    parser.add_argument("--model-path", default="models/cropmodel.pkl")
+    parser.add_argument("--npz-path", default="models/cropmodel.npz")
+    parser.add_argument("--output", default="benchmarks/results/inference.json")
+    args = parser.parse_args()
+    results = run(args.backends, args.batch_sizes, args.min_time, args.model_path, args.npz_path)
+    write_results({"inference": results}, args.output)
+
+if __name__ == "__main__":
+    main()
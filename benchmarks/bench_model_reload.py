@@ -0,0 +1,56 @@
+"""Requests/sec of the /predict scoring path with and without the model registry.
+
+"before" deserializes models/cropmodel.pkl on every request, as the old dict
+/predict handler did; "after" takes the in-memory model from ModelRegistry.
+Both then run the scale/predict steps of app.score_features. Run from the
+repository root::
+
+    python -m benchmarks.bench_model_reload --requests 200
+"""
+import argparse
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+
+from src.registry import ModelRegistry
+
+PAYLOAD = {"moi": 35.0, "temp": 29.0, "humidity": 61.0}
+
+def handle(model_data, data):
+    """Scale and score one reading once the model objects are available"""
+    input_scaled = model_data['scaler'].transform(np.array([[data['moi'], data['temp'], data['humidity']]]))
+    prediction = model_data['model'].predict_on_batch(input_scaled)
+    return float(np.asarray(prediction).reshape(-1)[0])
+
+def requests_per_second(fn, n_requests):
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(n_requests):
+        fn()
+    return n_requests / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default=os.getenv("MODEL_PATH", "models/cropmodel.pkl"))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(lambda: joblib.load(args.model_path), args.model_path)
+    results = {
+        "requests": args.requests,
+        "before_rps": requests_per_second(lambda: handle(joblib.load(args.model_path), PAYLOAD), args.requests),
+        "after_rps": requests_per_second(lambda: handle(registry.get().data, PAYLOAD), args.requests),
+    }
+    results["speedup"] = results["after_rps"] / results["before_rps"]
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
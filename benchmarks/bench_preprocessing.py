@@ -0,0 +1,43 @@
+"""Throughput of IrrigationPreprocessor at batch sizes 1-10k.
+
+    python -m benchmarks.bench_preprocessing --output benchmarks/results/preprocessing.json
+"""
+import argparse
+
+from src.preprocessing import IrrigationPreprocessor
+from benchmarks.common import BATCH_SIZES, throughput, write_results
+from benchmarks.synthetic import make_dataset, prediction_inputs
+
+def run(batch_sizes=BATCH_SIZES, min_time=0.5):
+    df = make_dataset(max(batch_sizes))
+    preprocessor = IrrigationPreprocessor()
+    preprocessor.preprocess_data(df.copy())
+    inputs = prediction_inputs(df)
+
+    results = {"prepare_batch": []}
+    for batch_size in batch_sizes:
+        batch = inputs.iloc[:batch_size]
+        columns = {name: batch[name].to_numpy() for name in batch.columns}
+        results["prepare_batch"].append(
+            throughput(lambda: preprocessor.prepare_batch(columns), batch_size, min_time=min_time)
+        )
+
+    row = inputs.iloc[0]
+    results["prepare_single_prediction"] = throughput(
+        lambda: preprocessor.prepare_single_prediction(
+            row['soil_type'], row['seedling_stage'], row['moi'], row['temp'], row['humidity']
+        ),
+        1, min_time=min_time
+    )
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=BATCH_SIZES)
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds to run each measurement")
+    parser.add_argument("--output", default="benchmarks/results/preprocessing.json")
+    args = parser.parse_args()
+    write_results({"preprocessing": run(args.batch_sizes, args.min_time)}, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Timing and result helpers shared by the benchmark scripts."""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+BATCH_SIZES = [1, 10, 100, 1000, 10000]
+
+def measure(fn, min_time=0.5, max_calls=10000):
+    """Call fn repeatedly for at least min_time seconds; per-call latency stats in ms"""
+    fn()  # warm up caches, lazy imports and graph tracing
+    timings = []
+    deadline = time.perf_counter() + min_time
+    while len(timings) < max_calls and (len(timings) < 3 or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return latency_summary(timings)
+
+def latency_summary(timings):
+    """p50/p95/p99/mean of a list of durations in seconds, reported in ms"""
+    ms = np.asarray(timings) * 1000.0
+    return {
+        "calls": int(len(ms)),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+    }
+
+def throughput(fn, batch_size, **kwargs):
+    """measure() plus rows/sec for a function that scores batch_size rows per call"""
+    stats = measure(fn, **kwargs)
+    stats["batch_size"] = batch_size
+    stats["rows_per_sec"] = batch_size / (stats["mean_ms"] / 1000.0)
+    return stats
+
+def environment():
+    """Enough context to tell whether two result files are comparable"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": commit,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def write_results(results, path):
+    """Write results plus environment metadata as JSON"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), **results}, f, indent=2)
+    print(f"Wrote {path}")
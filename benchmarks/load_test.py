@@ -0,0 +1,153 @@
+"""HTTP load test of the FastAPI app served by uvicorn on localhost.
+
+Starts the API in a subprocess, drives it from a pool of keep-alive client
+threads and reports p50/p95/p99 latency and requests/sec per scenario.
+
+    python -m benchmarks.load_test --backend numpy --concurrency 16 --requests 2000
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.common import latency_summary, write_results
+from benchmarks.synthetic import make_dataset, prediction_inputs
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class Server:
+    """uvicorn serving src.app:app on a free localhost port"""
+    def __init__(self, env=None, workers=1):
+        self.port = free_port()
+        self.env = {**os.environ, "TF_CPP_MIN_LOG_LEVEL": "3", **(env or {})}
+        self.workers = workers
+        self.process = None
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.app:app", "--host", "127.0.0.1",
+             "--port", str(self.port), "--workers", str(self.workers), "--log-level", "warning"],
+            env=self.env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        self._wait_ready()
+        return self
+
+    def _wait_ready(self, timeout=120):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {self.process.returncode}")
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=1)
+                conn.request("GET", "/model-info")
+                if conn.getresponse().status == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        raise TimeoutError("uvicorn did not become ready")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+def drive(port, path, bodies, n_requests, concurrency):
+    """Send n_requests POSTs from `concurrency` threads; returns latencies and errors"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    counter = iter(range(n_requests))
+    headers = {"Content-Type": "application/json"}
+
+    def worker():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        local = []
+        for i in counter:
+            body = bodies[i % len(bodies)]
+            started = time.perf_counter()
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                ok = False
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            local.append(time.perf_counter() - started)
+            if not ok:
+                with lock:
+                    errors[0] += 1
+        conn.close()
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    summary = latency_summary(latencies)
+    summary.update({
+        "path": path,
+        "concurrency": concurrency,
+        "errors": errors[0],
+        "elapsed_seconds": elapsed,
+        "requests_per_sec": len(latencies) / elapsed,
+    })
+    return summary
+
+def run(backend="keras", batching=False, concurrency=16, n_requests=1000, batch_size=100, workers=1):
+    records = prediction_inputs(make_dataset(5000)).to_dict(orient="records")
+    single_bodies = [json.dumps(r).encode() for r in records]
+    batch_bodies = [
+        json.dumps(records[i:i + batch_size]).encode()
+        for i in range(0, len(records) - batch_size + 1, batch_size)
+    ]
+
+    env = {"MODEL_BACKEND": backend, "PREDICT_BATCHING": "1" if batching else "0"}
+    with Server(env, workers) as server:
+        # Warm up lazy initialisation before measuring
+        drive(server.port, "/predict", single_bodies, concurrency, concurrency)
+        single = drive(server.port, "/predict", single_bodies, n_requests, concurrency)
+        batch = drive(server.port, "/predict/batch", batch_bodies, max(n_requests // batch_size, concurrency), concurrency)
+    batch["batch_size"] = batch_size
+    batch["readings_per_sec"] = batch["requests_per_sec"] * batch_size
+    return {
+        "backend": backend,
+        "batching": batching,
+        "workers": workers,
+        "predict": single,
+        "predict_batch": batch,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["keras", "numpy"], default="keras")
+    parser.add_argument("--batching", action="store_true", help="Enable PREDICT_BATCHING on the server")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output", default="benchmarks/results/load_test.json")
+    args = parser.parse_args()
+    results = run(args.backend, args.batching, args.concurrency, args.requests, args.batch_size, args.workers)
+    print(json.dumps(results, indent=2))
+    write_results({"load_test": results}, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Run the whole benchmark suite and write one JSON file for comparing runs.
+
+    python -m benchmarks.run_all                # full run
+    python -m benchmarks.run_all --quick        # smaller, faster settings
+    python -m benchmarks.run_all --skip load_test coldstart
+"""
+import argparse
+import time
+
+from benchmarks import bench_coldstart, bench_inference, bench_preprocessing, load_test
+from benchmarks.common import BATCH_SIZES, write_results
+
+SUITES = ["preprocessing", "inference", "coldstart", "load_test"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="Shorter measurements for a smoke run")
+    parser.add_argument("--skip", nargs="*", choices=SUITES, default=[])
+    parser.add_argument("--backends", nargs="+", choices=bench_inference.BACKENDS, default=bench_inference.BACKENDS)
+    parser.add_argument("--output", default=time.strftime("benchmarks/results/run-%Y%m%d-%H%M%S.json"))
+    args = parser.parse_args()
+
+    min_time = 0.1 if args.quick else 0.5
+    results = {}
+    if "preprocessing" not in args.skip:
+        results["preprocessing"] = bench_preprocessing.run(BATCH_SIZES, min_time)
+    if "inference" not in args.skip:
+        results["inference"] = bench_inference.run(args.backends, BATCH_SIZES, min_time)
+    if "coldstart" not in args.skip:
+        results["cold_start"] = bench_coldstart.run(repeats=1 if args.quick else 3)
+    if "load_test" not in args.skip:
+        n_requests = 200 if args.quick else 2000
+        results["load_test"] = [
+            load_test.run(backend, n_requests=n_requests)
+            for backend in ("keras", "numpy")
+            if backend in args.backends
+        ]
+    write_results(results, args.output)
+
+if __name__ == "__main__":
+    main()
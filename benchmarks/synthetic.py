@@ -0,0 +1,47 @@
+"""Synthetic sensor data shaped like data/cropdata_updated.csv.
+
+Column names, value ranges and categories follow the training set described
+in notebook/crop_data.ipynb, so benchmarks run offline without the real data.
+"""
+import numpy as np
+import pandas as pd
+
+CROPS = ['Carrot', 'Chilli', 'Potato', 'Tomato', 'Wheat']
+SOIL_TYPES = ['Alluvial Soil', 'Black Soil', 'Chalky Soil', 'Clay Soil', 'Loam Soil', 'Red Soil', 'Sandy Soil']
+SEEDLING_STAGES = [
+    'Flowering', 'Fruit/Grain/Bulb Formation', 'Germination', 'Harvest', 'Maturation',
+    'Pollination', 'Seedling Stage', 'Vegetative Growth / Root or Tuber Development'
+]
+
+def make_dataset(n_rows=16411, seed=42):
+    """DataFrame with the columns of cropdata_updated.csv"""
+    rng = np.random.default_rng(seed)
+    moi = rng.integers(1, 101, n_rows)
+    temp = rng.integers(13, 47, n_rows)
+    humidity = rng.uniform(15, 91, n_rows).round(1)
+    # Dry, hot and less humid readings need irrigation, with some label noise
+    score = (50 - moi) / 25 + (temp - 29) / 10 - (humidity - 63) / 45
+    result = (score + rng.normal(0, 0.5, n_rows) > 0).astype(int)
+    return pd.DataFrame({
+        'crop ID': rng.choice(CROPS, n_rows),
+        'soil_type': rng.choice(SOIL_TYPES, n_rows),
+        'Seedling Stage': rng.choice(SEEDLING_STAGES, n_rows),
+        'MOI': moi,
+        'temp': temp,
+        'humidity': humidity,
+        'result': result,
+    })
+
+def prediction_inputs(df):
+    """Rename dataset columns to the names used by the prediction APIs"""
+    return pd.DataFrame({
+        'soil_type': df['soil_type'].to_numpy(),
+        'seedling_stage': df['Seedling Stage'].to_numpy(),
+        'moi': df['MOI'].to_numpy(dtype=float),
+        'temp': df['temp'].to_numpy(dtype=float),
+        'humidity': df['humidity'].to_numpy(dtype=float),
+    })
+
+def write_csv(path, n_rows=16411, seed=42):
+    make_dataset(n_rows, seed).to_csv(path, index=False)
+    return path
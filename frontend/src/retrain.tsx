@@ -10,13 +10,27 @@ import {
 } from "@mui/material";
 
 interface TrainingResult {
-  message: string;
+  job_id: string;
+  status: "queued" | "running" | "completed" | "failed";
+  epoch: number;
+  max_epochs: number;
+  error: string | null;
   history: {
     accuracy: number;
     val_accuracy: number;
-  };
+  } | null;
+}
+
+interface RetrainJob {
+  message: string;
+  job_id: string;
+  status: string;
 }
 
+const POLL_INTERVAL_MS = 1000;
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
 const Retrain: React.FC = () => {
   const [file, setFile] = useState<File | null>(null);
   const [loading, setLoading] = useState(false);
@@ -25,6 +39,7 @@ const Retrain: React.FC = () => {
   const [trainingMetrics, setTrainingMetrics] = useState<TrainingResult | null>(
     null
   );
+  const [progress, setProgress] = useState<string | null>(null);
 
   const handleFileChange = (event: React.ChangeEvent<HTMLInputElement>) => {
     if (event.target.files && event.target.files[0]) {
@@ -42,12 +57,13 @@ const Retrain: React.FC = () => {
     setError(null);
     setResult(null);
     setTrainingMetrics(null);
+    setProgress(null);
 
     const formData = new FormData();
     formData.append("file", file);
 
     try {
-      const response = await axios.post<TrainingResult>(
+      const response = await axios.post<RetrainJob>(
         "http://localhost:8000/retrain",
         formData,
         {
@@ -57,8 +73,23 @@ const Retrain: React.FC = () => {
         }
       );
 
-      setTrainingMetrics(response.data);
-      setResult("Model retrained successfully!");
+      // Training runs in the background; poll the job until it finishes
+      let job: TrainingResult;
+      do {
+        await sleep(POLL_INTERVAL_MS);
+        const status = await axios.get<TrainingResult>(
+          `http://localhost:8000/retrain/${response.data.job_id}`
+        );
+        job = status.data;
+        setProgress(`Epoch ${job.epoch} of up to ${job.max_epochs}`);
+      } while (job.status === "queued" || job.status === "running");
+
+      if (job.status === "failed") {
+        setError(job.error ?? "Retraining failed");
+      } else {
+        setTrainingMetrics(job);
+        setResult("Model retrained successfully!");
+      }
     } catch (err) {
       setError(
         err instanceof Error
@@ -67,6 +98,7 @@ const Retrain: React.FC = () => {
       );
     } finally {
       setLoading(false);
+      setProgress(null);
     }
   };
 
@@ -122,6 +154,15 @@ const Retrain: React.FC = () => {
           {loading ? <CircularProgress size={24} /> : "Retrain Model"}
         </Button>
 
+        {progress && (
+          <Typography
+            sx={{ marginTop: 2 }}
+            style={{ fontFamily: "monospace" }}
+          >
+            {progress}
+          </Typography>
+        )}
+
         {error && (
           <Alert severity="error" sx={{ marginTop: 2 }}>
             {error}
@@ -134,7 +175,7 @@ const Retrain: React.FC = () => {
           </Alert>
         )}
 
-        {trainingMetrics && (
+        {trainingMetrics?.history && (
           <Box sx={{ marginTop: 3 }}>
             <Typography
               variant="h6"
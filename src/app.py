@@ -1,15 +1,115 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError
+from typing import List, Optional
+from datetime import datetime
+import io
+import json
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
 import joblib
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-import tensorflow as tf
+from sklearn.preprocessing import LabelEncoder
+from .batching import MicroBatcher
+from .numpy_engine import NumpyModel
+from .forest import FlatForest
+from .cache import PredictionCache
+from .forecasting import ForecastStore
+from .training import RetrainInProgress, RetrainJobManager
+from .registry import ModelRegistry
+from .metrics import MetricsRegistry, MetricsMiddleware, BATCH_SIZE_BUCKETS
+
+# Debug output is skipped entirely unless LOG_LEVEL=DEBUG; even then only a
+# LOG_SAMPLE_RATE fraction of requests log their inputs and outputs
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+
+package_logger = logging.getLogger("src")
+package_logger.setLevel(LOG_LEVEL)
+if not package_logger.handlers:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    package_logger.addHandler(handler)
+logger = logging.getLogger(__name__)
+
+def debug_sampled():
+    """Whether this request should emit debug logs"""
+    return logger.isEnabledFor(logging.DEBUG) and (LOG_SAMPLE_RATE >= 1.0 or random.random() < LOG_SAMPLE_RATE)
+
+metrics = MetricsRegistry()
+REQUESTS = metrics.counter("irrigation_requests_total", "HTTP requests by endpoint", ["endpoint", "method", "status"])
+ERRORS = metrics.counter("irrigation_request_errors_total", "HTTP requests answered with 4xx/5xx", ["endpoint", "method", "status"])
+REQUEST_SECONDS = metrics.histogram("irrigation_request_duration_seconds", "End-to-end request latency", ["endpoint", "method"])
+STAGE_SECONDS = metrics.histogram("irrigation_prediction_stage_seconds", "Time spent per prediction stage", ["stage"])
+BATCH_SIZES = metrics.histogram("irrigation_inference_batch_size", "Readings per inference call", buckets=BATCH_SIZE_BUCKETS)
+CACHE_LOOKUPS = metrics.gauge("irrigation_prediction_cache_lookups", "Prediction cache lookups by result", ["result"])
+CACHE_HIT_RATE = metrics.gauge("irrigation_prediction_cache_hit_rate", "Fraction of cache lookups that were hits")
+CACHE_SIZE = metrics.gauge("irrigation_prediction_cache_entries", "Entries in the prediction cache")
+MODEL_INFO = metrics.gauge("irrigation_model_info", "Active model version", ["version", "backend"])
+QUEUE_DEPTH = metrics.gauge("irrigation_batcher_queue_depth", "Readings waiting in the micro-batcher")
+
+MODEL_PATH = os.getenv("MODEL_PATH", "models/cropmodel.pkl")
+NUMPY_MODEL_PATH = os.getenv("NUMPY_MODEL_PATH", "models/cropmodel.npz")
+# "keras" serves the pickled Keras model; "numpy" serves the exported .npz
+# artifact through NumpyModel and never imports TensorFlow
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "keras").lower()
+# Compiled random forest served when src.train_pipeline picked the forest
+FOREST_PATH = os.getenv("FOREST_PATH", "models/cropmodel_forest")
+# Batches above this many rows are scored by the saved sklearn estimator, which
+# each worker unpickles into private memory on first use. sklearn's traversal
+# wins from ~300 rows (100 trees, 16k training rows); 0 disables the fallback
+FLAT_FOREST_MAX_BATCH = int(os.getenv("FLAT_FOREST_MAX_BATCH", "0"))
+# Bytes copied per read when spooling a /retrain upload to disk
+UPLOAD_CHUNK_BYTES = 1 << 20
+# Seconds between checks of the artifact's mtime for automatic reloads
+MODEL_CHECK_INTERVAL = float(os.getenv("MODEL_CHECK_INTERVAL", "2"))
+
+# Optional in-process cache of predictions keyed on readings quantized to the
+# sensor resolution (moi, temp, humidity); PREDICTION_CACHE_SIZE=0 disables it
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "0"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "0"))
+PREDICTION_CACHE_RESOLUTION = [float(x) for x in os.getenv("PREDICTION_CACHE_RESOLUTION", "1,1,0.1").split(",")]
+
+# Streaming forecasts: readings kept per field, fields kept in memory, and the
+# hours ahead each reading is forecast for
+FORECAST_WINDOW = int(os.getenv("FORECAST_WINDOW", "12"))
+FORECAST_MAX_FIELDS = int(os.getenv("FORECAST_MAX_FIELDS", "10000"))
+FORECAST_HORIZONS = [float(x) for x in os.getenv("FORECAST_HORIZONS", "1,3,6").split(",")]
+
+# Opt-in coalescing of concurrent /predict calls into batched inference
+BATCHING_ENABLED = os.getenv("PREDICT_BATCHING", "false").lower() in ("1", "true", "yes")
+BATCHING_MAX_SIZE = int(os.getenv("PREDICT_BATCH_MAX_SIZE", "64"))
+BATCHING_MAX_WAIT_MS = float(os.getenv("PREDICT_BATCH_MAX_WAIT_MS", "5"))
+
+batcher = None
+
+@asynccontextmanager
+async def lifespan(app):
+    global batcher
+    if BATCHING_ENABLED:
+        batcher = MicroBatcher(
+            predict_probabilities,
+            max_batch_size=BATCHING_MAX_SIZE,
+            max_wait_ms=BATCHING_MAX_WAIT_MS
+        )
+        await batcher.start()
+    yield
+    if batcher is not None:
+        await batcher.stop()
+        batcher = None
+    retrain_jobs.shutdown()
 
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware, requests=REQUESTS, errors=ERRORS, duration=REQUEST_SECONDS)
 
 # Enable CORS
 app.add_middleware(
@@ -23,191 +123,412 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load the model and preprocessors
+def label_encoder_from_classes(classes):
+    """Rebuild a fitted LabelEncoder from its stored classes"""
+    encoder = LabelEncoder()
+    encoder.classes_ = classes
+    return encoder
+
+def load_model_data():
+    """Load the model and preprocessors for the configured backend"""
+    if MODEL_BACKEND == "numpy":
+        engine = NumpyModel.load(NUMPY_MODEL_PATH)
+        return {
+            'model': engine,
+            'scaler': engine.scaler,
+            'le_soil': label_encoder_from_classes(engine.soil_classes),
+            'le_seedling': label_encoder_from_classes(engine.seedling_classes)
+        }
+    model_data = joblib.load(MODEL_PATH)
+    if 'forest_source' in model_data:
+        # Forest artifacts hold no estimator: every worker memory-maps the
+        # same flattened copy instead of unpickling its own forest
+        forest = FlatForest.load(FOREST_PATH)
+        if forest.source != model_data['forest_source']:
+            raise ValueError(f"{FOREST_PATH} was compiled from a different forest than {MODEL_PATH}")
+        model_data['forest'] = forest
+    return model_data
+
+# Load the model and preprocessors once. Handlers take one snapshot per call
+# from the registry, so a reload replaces model, scaler and encoders together.
 try:
-    model_data = joblib.load('models/cropmodel.pkl')
-    model = model_data['model']
-    scaler = model_data['scaler']
-    le_soil = model_data['le_soil']
-    le_seedling = model_data['le_seedling']
+    registry = ModelRegistry(
+        load_model_data,
+        NUMPY_MODEL_PATH if MODEL_BACKEND == "numpy" else MODEL_PATH,
+        check_interval=MODEL_CHECK_INTERVAL
+    )
 except Exception as e:
-    print(f"Error loading model: {e}")
+    logger.error("Error loading model: %s", e)
     raise Exception("Model files not found. Please ensure model is trained and saved correctly.")
 
+def reload_model_data():
+    """Swap in freshly written artifacts without a restart"""
+    registry.reload()
+
+prediction_cache = None
+if PREDICTION_CACHE_SIZE > 0:
+    prediction_cache = PredictionCache(
+        max_size=PREDICTION_CACHE_SIZE,
+        ttl=PREDICTION_CACHE_TTL,
+        resolution=PREDICTION_CACHE_RESOLUTION
+    )
+
+forecast_store = ForecastStore(window=FORECAST_WINDOW, max_fields=FORECAST_MAX_FIELDS)
+
+retrain_jobs = RetrainJobManager(MODEL_PATH, NUMPY_MODEL_PATH, on_complete=reload_model_data)
+
 class PredictionInput(BaseModel):
+    # NaN/inf would be scored as real readings and cannot be JSON-encoded back
+    model_config = ConfigDict(allow_inf_nan=False)
+
     moi: float
     temp: float
     humidity: float
     soil_type: str
     seedling_stage: str
 
+class ForecastReading(PredictionInput):
+    field_id: str
+    # Defaults to the time the reading arrives
+    timestamp: Optional[datetime] = None
+
+# Upper bound on the number of readings scored by a single /predict/batch call
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "10000"))
+
+NUMERICAL_INPUTS = ["moi", "temp", "humidity"]
+BATCH_COLUMNS = NUMERICAL_INPUTS + ["soil_type", "seedling_stage"]
+
+_batch_adapter = TypeAdapter(List[PredictionInput])
+
+def get_recommendation(probability):
+    """Generate recommendation based on prediction probability"""
+    if probability > 0.8:
+        return "Immediate irrigation recommended"
+    elif probability > 0.6:
+        return "Consider irrigation in the next 24 hours"
+    elif probability > 0.4:
+        return "Monitor conditions closely"
+    else:
+        return "No immediate irrigation needed"
+
+def predict_probabilities(features):
+    """Score an (n, 3) array of moi/temp/humidity readings, using the cache if enabled"""
+    loaded = registry.get()
+    if prediction_cache is None or not prediction_cache.cacheable(features).all():
+        # Readings without a cache key are scored as they are
+        return score_features(loaded.data, features)
+
+    with STAGE_SECONDS.time(stage="cache"):
+        keys, snapped = prediction_cache.quantize(features)
+        probabilities = prediction_cache.lookup(loaded.version, keys)
+        misses = np.flatnonzero(np.isnan(probabilities))
+    if len(misses):
+        # Score each distinct missing reading once
+        unique_keys, first, inverse = np.unique(keys[misses], axis=0, return_index=True, return_inverse=True)
+        scored = score_features(loaded.data, snapped[misses][first])
+        probabilities[misses] = scored[inverse.reshape(-1)]
+        prediction_cache.store(loaded.version, unique_keys, scored)
+    return probabilities
+
+def score_features(current, features):
+    """Score an (n, 3) array of moi/temp/humidity readings in one vectorized pass"""
+    BATCH_SIZES.observe(len(features))
+    with STAGE_SECONDS.time(stage="scaling"):
+        features_scaled = current['scaler'].transform(features)
+    with STAGE_SECONDS.time(stage="inference"):
+        if 'forest' in current:
+            forest = current['forest']
+            use_estimator = 0 < FLAT_FOREST_MAX_BATCH < len(features_scaled)
+            estimator = forest.estimator() if use_estimator else None
+            scorer = estimator if estimator is not None else forest
+            predictions = scorer.predict_proba(features_scaled)[:, 1]
+        else:
+            # predict_on_batch skips the per-call dataset/callback setup of model.predict
+            predictions = current['model'].predict_on_batch(features_scaled)
+    return np.asarray(predictions, dtype=np.float64).reshape(-1)
+
+def build_prediction(input_data, probability):
+    """Build the response payload for one scored reading"""
+    return {
+        "needs_irrigation": bool(probability > 0.5),
+        "confidence": float(probability),
+        "recommendation": get_recommendation(probability),
+        "input_parameters": {
+            "soil_type": input_data.soil_type,
+            "seedling_stage": input_data.seedling_stage,
+            "moi": input_data.moi,
+            "temp": input_data.temp,
+            "humidity": input_data.humidity
+        }
+    }
+
+def predict_batch(readings):
+    """Score a list of PredictionInput readings, preserving input order"""
+    if not readings:
+        return []
+    features = np.array(
+        [[r.moi, r.temp, r.humidity] for r in readings],
+        dtype=np.float64
+    )
+    probabilities = predict_probabilities(features)
+    with STAGE_SECONDS.time(stage="response"):
+        return [build_prediction(r, p) for r, p in zip(readings, probabilities)]
+
+def parse_batch_body(body, content_type):
+    """Parse a JSON array, CSV or NDJSON request body into a list of records"""
+    if content_type in ("text/csv", "application/csv"):
+        # Blank cells stay empty strings so validation rejects them with a 422
+        # instead of turning them into NaN
+        df = pd.read_csv(
+            io.BytesIO(body),
+            dtype={"soil_type": str, "seedling_stage": str},
+            keep_default_na=False
+        )
+        missing = [c for c in BATCH_COLUMNS if c not in df.columns]
+        if missing:
+            raise HTTPException(status_code=422, detail=f"CSV is missing columns: {missing}")
+        return df[BATCH_COLUMNS].to_dict(orient="records")
+    if content_type in ("application/x-ndjson", "application/jsonl", "application/ndjson"):
+        return [json.loads(line) for line in body.splitlines() if line.strip()]
+    records = json.loads(body) if body else []
+    if not isinstance(records, list):
+        raise HTTPException(status_code=422, detail="Expected a JSON array of readings")
+    return records
+
+def forecast_reading(reading):
+    """Add a reading to its field's window and score it now and at each forecast horizon"""
+    # Scored through predict_probabilities, not IrrigationPreprocessor: the
+    # served artifact's scaler and model take only moi/temp/humidity, and this
+    # shares the registry snapshot and prediction cache with /predict
+    timestamp = reading.timestamp.timestamp() if reading.timestamp is not None else time.time()
+    rolling, projected = forecast_store.update(
+        reading.field_id, timestamp, reading.moi, reading.temp, reading.humidity, FORECAST_HORIZONS
+    )
+    # The current reading and every horizon are scored in one call
+    features = np.vstack([[reading.moi, reading.temp, reading.humidity], projected])
+    probabilities = predict_probabilities(features)
+    with STAGE_SECONDS.time(stage="response"):
+        return {
+            "field_id": reading.field_id,
+            "timestamp": timestamp,
+            "current": build_prediction(reading, probabilities[0]),
+            "rolling": rolling,
+            "forecast": [
+                {
+                    "hours_ahead": hours,
+                    "moi": float(row[0]),
+                    "temp": float(row[1]),
+                    "humidity": float(row[2]),
+                    "needs_irrigation": bool(probability > 0.5),
+                    "confidence": float(probability),
+                    "recommendation": get_recommendation(probability)
+                }
+                for hours, row, probability in zip(FORECAST_HORIZONS, projected, probabilities[1:])
+            ]
+        }
+
+async def forecast_line(line):
+    """Forecast one JSON reading; failures become an error object so the stream keeps going"""
+    try:
+        reading = ForecastReading.model_validate_json(line)
+    except ValidationError as e:
+        # The raw line is left out: it is bytes, which json.dumps cannot encode
+        return {"error": e.errors(include_url=False, include_context=False, include_input=False)}
+    try:
+        return await run_in_threadpool(forecast_reading, reading)
+    except ValueError as e:
+        return {"field_id": reading.field_id, "error": str(e)}
+    except Exception as e:
+        logger.exception("Forecast error")
+        return {"field_id": reading.field_id, "error": f"Forecast error: {str(e)}"}
+
 @app.post("/predict")
 async def predict_irrigation(input_data: PredictionInput):
     try:
-        # Create features array with only numerical features
-        features = np.array([[
-            input_data.moi,
-            input_data.temp, 
-            input_data.humidity
-        ]])
-        
-        # Scale features
-        features_scaled = scaler.transform(features)
-        
-        # Make prediction
-        prediction = model.predict(features_scaled)[0]
-        probability = float(prediction[0]) if hasattr(prediction, '__len__') else float(prediction)
-        
-        print(f"Debug - Features: {features}")  # Debug logging
-        print(f"Debug - Scaled features: {features_scaled}")  # Debug logging
-        print(f"Debug - Raw prediction: {prediction}")  # Debug logging
-        print(f"Debug - Probability: {probability}")  # Debug logging
-        
-        # Generate recommendation based on probability
-        if probability > 0.8:
-            recommendation = "Immediate irrigation recommended"
-        elif probability > 0.6:
-            recommendation = "Consider irrigation in the next 24 hours"
-        elif probability > 0.4:
-            recommendation = "Monitor conditions closely"
+        if batcher is not None:
+            probability = await batcher.submit([input_data.moi, input_data.temp, input_data.humidity])
+            with STAGE_SECONDS.time(stage="response"):
+                result = build_prediction(input_data, probability)
         else:
-            recommendation = "No immediate irrigation needed"
-        
-        return {
-            "needs_irrigation": bool(probability > 0.5),
-            "confidence": probability,
-            "recommendation": recommendation,
-            "input_parameters": {
-                "soil_type": input_data.soil_type,
-                "seedling_stage": input_data.seedling_stage,
-                "moi": input_data.moi,
-                "temp": input_data.temp,
-                "humidity": input_data.humidity
-            }
-        }
-        
+            # Keep TensorFlow off the event loop so other requests are not blocked
+            result = (await run_in_threadpool(predict_batch, [input_data]))[0]
+
+        if debug_sampled():
+            logger.debug("Prediction for %s: %s", result['input_parameters'], result['confidence'])
+
+        return result
+
     except Exception as e:
-        print(f"Detailed error: {str(e)}")  # Debug logging
+        logger.exception("Prediction error")
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
+@app.post("/predict/batch")
+async def predict_irrigation_batch(request: Request):
+    """Score many readings at once; accepts a JSON array, CSV or NDJSON body"""
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip().lower()
+    body = await request.body()
+    validation_started = time.perf_counter()
+    try:
+        records = parse_batch_body(body, content_type)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not parse batch: {str(e)}")
+
+    if len(records) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(records)} readings exceeds the maximum of {MAX_BATCH_SIZE}"
+        )
+
+    try:
+        readings = _batch_adapter.validate_python(records)
+    except ValidationError as e:
+        # Inputs are left out: they may be NaN or bytes, which are not JSON-encodable
+        raise HTTPException(
+            status_code=422,
+            detail=e.errors(include_url=False, include_context=False, include_input=False)
+        )
+    STAGE_SECONDS.observe(time.perf_counter() - validation_started, stage="validation")
+
+    try:
+        predictions = await run_in_threadpool(predict_batch, readings)
+        return {"count": len(predictions), "predictions": predictions}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+class DuplexStreamingResponse(StreamingResponse):
+    """StreamingResponse whose body is produced while the request body is still being read.
+
+    The base class watches ``receive`` for a client disconnect while streaming,
+    which would swallow the request chunks the generator is waiting for.
+    """
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+@app.post("/forecast/stream")
+async def forecast_stream(request: Request):
+    """NDJSON in, NDJSON out: one forecast line per reading, sent as each reading arrives"""
+    async def forecasts():
+        pending = b""
+        async for chunk in request.stream():
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield json.dumps(await forecast_line(line)) + "\n"
+        if pending.strip():
+            yield json.dumps(await forecast_line(pending)) + "\n"
+
+    return DuplexStreamingResponse(forecasts(), media_type="application/x-ndjson")
+
+@app.websocket("/forecast/ws")
+async def forecast_websocket(websocket: WebSocket):
+    """Send back a forecast for every JSON reading received on the socket"""
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive_text()
+            await websocket.send_json(await forecast_line(message))
+    except WebSocketDisconnect:
+        pass
+
+@app.get("/forecast/{field_id}")
+async def get_field_state(field_id: str):
+    """Rolling window features of one field"""
+    rolling = forecast_store.features(field_id)
+    if rolling is None:
+        raise HTTPException(status_code=404, detail=f"No readings for field: {field_id}")
+    return {"field_id": field_id, "rolling": rolling}
+
+@app.get("/batching-stats")
+async def get_batching_stats():
+    """Queue depth and batch-size metrics of the /predict micro-batcher"""
+    if batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **batcher.stats()}
+
+def collect_gauges():
+    current = registry.get()
+    MODEL_INFO.clear()
+    MODEL_INFO.set(1, version=current.version, backend=MODEL_BACKEND)
+    QUEUE_DEPTH.set(batcher.queue_depth() if batcher is not None else 0)
+    if prediction_cache is not None:
+        stats = prediction_cache.stats()
+        CACHE_LOOKUPS.set(stats["hits"], result="hit")
+        CACHE_LOOKUPS.set(stats["misses"], result="miss")
+        CACHE_HIT_RATE.set(stats["hit_rate"])
+        CACHE_SIZE.set(stats["size"])
+
+metrics.add_collector(collect_gauges)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Request, stage latency, batch size and model metrics in Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/model-info")
 async def get_model_info():
     """Get information about the current model"""
     try:
+        current = registry.get()
         return {
             "features": ["MOI", "Temperature", "Humidity", "Soil Type", "Seedling Stage"],
-            "soil_types": list(le_soil.classes_),
-            "seedling_stages": list(le_seedling.classes_)
+            "soil_types": current.data['le_soil'].classes_.tolist(),
+            "seedling_stages": current.data['le_seedling'].classes_.tolist(),
+            "backend": MODEL_BACKEND,
+            **registry.info(),
+            "prediction_cache": prediction_cache.stats() if prediction_cache is not None else None,
+            "forecast_store": forecast_store.stats()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving model info: {str(e)}")
 
-@app.post("/retrain")
-async def retrain_model(file: UploadFile = File(...)):
+@app.post("/model/reload")
+async def reload_model():
+    """Reload the model artifact from disk if its content changed"""
     try:
-        contents = await file.read()
-        df = pd.read_csv(pd.io.common.BytesIO(contents))
-        
-        # Prepare numerical features only
-        numerical_features = ['MOI', 'temp', 'humidity']
-        X = df[numerical_features].values
-        y = df['result'].values
-        
-        # Scale features
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
-        
-        # Create model with regularization and different architecture
-        model = tf.keras.Sequential([
-            tf.keras.layers.Dense(32, activation='relu', input_shape=(3,),
-                                kernel_regularizer=tf.keras.regularizers.l2(0.01)),
-            tf.keras.layers.Dropout(0.3),
-            tf.keras.layers.Dense(16, activation='relu',
-                                kernel_regularizer=tf.keras.regularizers.l2(0.01)),
-            tf.keras.layers.Dropout(0.3),
-            tf.keras.layers.Dense(8, activation='relu',
-                                kernel_regularizer=tf.keras.regularizers.l2(0.01)),
-            tf.keras.layers.Dropout(0.3),
-            tf.keras.layers.Dense(1, activation='sigmoid')
-        ])
-        
-        model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=0.001), 
-                     loss='binary_crossentropy',
-                     metrics=['accuracy'])
-        
-        # Add early stopping to prevent overfitting
-        early_stopping = tf.keras.callbacks.EarlyStopping(
-            monitor='val_loss',
-            patience=5,
-            restore_best_weights=True
-        )
-        
-        history = model.fit(X_scaled, y,
-                          epochs=50,
-                          batch_size=32,
-                          validation_split=0.2,
-                          callbacks=[early_stopping])
-        
-        # Save model and scaler
-        model_data = {
-            'model': model,
-            'scaler': scaler,
-            'le_soil': le_soil,
-            'le_seedling': le_seedling
-        }
-        joblib.dump(model_data, 'models/cropmodel.pkl')
-        
-        return {
-            "message": "Model retrained successfully",
-            "history": {
-                "accuracy": float(history.history['accuracy'][-1]),
-                "val_accuracy": float(history.history['val_accuracy'][-1])
-            }
-        }
+        await run_in_threadpool(registry.reload)
+        return registry.info()
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Retraining error: {str(e)}")
-    
-@app.post("/predict")
-async def predict(data: dict):
+        raise HTTPException(status_code=500, detail=f"Reload error: {str(e)}")
+
+@app.post("/retrain", status_code=202)
+async def retrain_model(file: UploadFile = File(...)):
+    """Start a background retraining job; poll /retrain/{job_id} for progress"""
+    running = retrain_jobs.active_job()
+    if running is not None:
+        # Checked before copying the upload; submit() re-checks under the lock
+        raise HTTPException(status_code=409, detail=f"Retraining job {running} is already running")
+    fd, csv_path = tempfile.mkstemp(suffix=".csv")
     try:
-        # Load the saved model and preprocessing objects
-        model_data = joblib.load('models/cropmodel.pkl')
-        model = model_data['model']
-        scaler = model_data['scaler']
-        le_soil = model_data['le_soil']
-        le_seedling = model_data['le_seedling']
-
-        # Transform categorical inputs
-        soil_type_encoded = le_soil.transform([data['soil_type']])[0]
-        seedling_stage_encoded = le_seedling.transform([data['seedling_stage']])[0]
-
-        # Create input array
-        input_data = np.array([[
-            data['moi'],
-            data['temp'], 
-            data['humidity']
-        ]])
-
-        # Scale the numerical features
-        input_scaled = scaler.transform(input_data)
-
-        # Make prediction
-        prediction = model.predict(input_scaled)
-        confidence = float(prediction[0][0])
-        needs_irrigation = bool(confidence >= 0.5)
-
-        # Generate recommendation
-        if needs_irrigation:
-            recommendation = "Based on the current conditions, irrigation is recommended."
-        else:
-            recommendation = "Based on the current conditions, irrigation is not necessary at this time."
+        # Spool the upload to disk in chunks and hand the path to the worker
+        # process, so the dataset is never held in memory here. The copy runs
+        # in a thread so multi-GB uploads do not block the event loop
+        with os.fdopen(fd, "wb") as f:
+            await run_in_threadpool(shutil.copyfileobj, file.file, f, UPLOAD_CHUNK_BYTES)
 
+        current = registry.get().data
+        job = retrain_jobs.submit(csv_path, current['le_soil'], current['le_seedling'])
         return {
-            "needs_irrigation": needs_irrigation,
-            "confidence": confidence,
-            "recommendation": recommendation,
-            "input_parameters": data
+            "message": "Retraining started",
+            "job_id": job["job_id"],
+            "status": job["status"]
         }
-
+    except RetrainInProgress as e:
+        os.remove(csv_path)
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+        if os.path.exists(csv_path):
+            os.remove(csv_path)
+        raise HTTPException(status_code=500, detail=f"Retraining error: {str(e)}")
+
+@app.get("/retrain/{job_id}")
+async def get_retrain_status(job_id: str):
+    """Status and per-epoch metrics of a retraining job"""
+    job = retrain_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown retraining job: {job_id}")
+    return job
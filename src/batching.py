@@ -0,0 +1,164 @@
+import asyncio
+import bisect
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Shared with the /metrics batch-size histogram so both report the same buckets
+from .metrics import BATCH_SIZE_BUCKETS
+
+class MicroBatcher:
+    """Coalesce concurrent single predictions into batched inference calls.
+
+    Callers submit one feature row each and await the result. A background
+    task collects queued rows until either ``max_batch_size`` rows are waiting
+    or ``max_wait_ms`` has passed since the first row arrived, then scores the
+    whole batch with ``predict_fn`` in a worker thread so the event loop stays
+    free to accept more requests.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=5.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._queue = None
+        self._worker = None
+        self._executor = None
+        self._batch = []
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.requests_total = 0
+        self.batches_total = 0
+        self.errors_total = 0
+        self.last_batch_size = 0
+        self.max_observed_batch_size = 0
+        self.queue_wait_seconds_total = 0.0
+        self.inference_seconds_total = 0.0
+        self.batch_size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+
+    @property
+    def running(self):
+        return self._worker is not None and not self._worker.done()
+
+    def queue_depth(self):
+        """Number of readings waiting to be scored"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        """Start the background batching task on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        # A single thread keeps model calls serialized and off the event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="micro-batcher")
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the batching task and fail every reading not yet answered"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        # Rows already taken off the queue for the current batch would
+        # otherwise never be answered
+        pending = self._batch
+        self._batch = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+        for _, future, _ in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Prediction batcher stopped"))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def submit(self, features):
+        """Queue one feature row and wait for its predicted probability"""
+        if not self.running:
+            raise RuntimeError("Prediction batcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((features, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self, batch):
+        """Wait for the first queued row, then move more into ``batch`` until full or timed out"""
+        loop = asyncio.get_running_loop()
+        batch.append(await self._queue.get())
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Kept on self so stop() can fail rows already off the queue
+            self._batch = batch = []
+            await self._collect(batch)
+            # Skip callers that gave up (e.g. the client disconnected)
+            batch[:] = [item for item in batch if not item[1].done()]
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            features = np.array([item[0] for item in batch], dtype=np.float64)
+            try:
+                probabilities = await loop.run_in_executor(self._executor, self.predict_fn, features)
+            except Exception as e:
+                self.errors_total += 1
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, future, _), probability in zip(batch, probabilities):
+                    if not future.done():
+                        future.set_result(float(probability))
+            finished = time.perf_counter()
+
+            self._record_batch(batch, started, finished)
+
+    def _record_batch(self, batch, started, finished):
+        size = len(batch)
+        self.requests_total += size
+        self.batches_total += 1
+        self.last_batch_size = size
+        self.max_observed_batch_size = max(self.max_observed_batch_size, size)
+        self.queue_wait_seconds_total += sum(started - queued_at for _, _, queued_at in batch)
+        self.inference_seconds_total += finished - started
+        self.batch_size_counts[bisect.bisect_left(BATCH_SIZE_BUCKETS, size)] += 1
+
+    def stats(self):
+        """Queue depth and batch-size metrics for tuning throughput vs latency"""
+        # Cumulative counts, i.e. number of batches with size <= edge
+        cumulative = np.cumsum(self.batch_size_counts).tolist()
+        histogram = {f"le_{edge}": count for edge, count in zip(BATCH_SIZE_BUCKETS, cumulative)}
+        histogram["le_inf"] = cumulative[-1]
+        return {
+            "running": self.running,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "queue_depth": self.queue_depth(),
+            "requests_total": self.requests_total,
+            "batches_total": self.batches_total,
+            "errors_total": self.errors_total,
+            "last_batch_size": self.last_batch_size,
+            "max_observed_batch_size": self.max_observed_batch_size,
+            "mean_batch_size": self.requests_total / self.batches_total if self.batches_total else 0.0,
+            "mean_queue_wait_ms": 1000.0 * self.queue_wait_seconds_total / self.requests_total if self.requests_total else 0.0,
+            "mean_inference_ms": 1000.0 * self.inference_seconds_total / self.batches_total if self.batches_total else 0.0,
+            "batch_size_histogram": histogram,
+        }
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# Largest grid step that converts to int64 exactly
+MAX_STEPS = 2.0 ** 62
+
+class PredictionCache:
+    """LRU cache of predicted probabilities keyed on quantized sensor readings.
+
+    Readings are snapped to the sensor ``resolution`` (one step per feature)
+    before lookup, and misses are scored on the snapped values too, so a cached
+    answer is exactly what the model would return for that reading. Entries
+    older than ``ttl`` seconds are treated as misses, the least recently used
+    entry is evicted once ``max_size`` is reached, and the whole cache is
+    dropped as soon as a different model version is seen.
+    """
+
+    def __init__(self, max_size=10000, ttl=None, resolution=(1.0, 1.0, 0.1)):
+        self.max_size = int(max_size)
+        self.ttl = ttl if ttl else None
+        self.resolution = np.asarray(resolution, dtype=np.float64)
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def cacheable(self, features):
+        """Boolean mask of the rows of an (n, k) array that have an integer grid key.
+
+        NaN, inf and values too large for int64 would otherwise all collapse
+        onto the same key and share a cached answer.
+        """
+        steps = np.rint(np.asarray(features, dtype=np.float64) / self.resolution)
+        return (np.abs(steps) < MAX_STEPS).all(axis=1)
+
+    def quantize(self, features):
+        """Integer grid keys and the snapped float features for an (n, k) array.
+
+        Raises ValueError for rows that are not ``cacheable``.
+        """
+        features = np.asarray(features, dtype=np.float64)
+        invalid = ~self.cacheable(features)
+        if invalid.any():
+            raise ValueError(f"Cannot cache non-finite or out-of-range readings in rows {np.flatnonzero(invalid).tolist()}")
+        steps = np.rint(features / self.resolution).astype(np.int64)
+        return steps, steps * self.resolution
+
+    def _check_version(self, version):
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def lookup(self, version, keys):
+        """Cached probabilities for each key row, NaN where there is no fresh entry"""
+        now = time.monotonic()
+        results = np.full(len(keys), np.nan)
+        with self._lock:
+            self._check_version(version)
+            for i, key in enumerate(map(tuple, keys.tolist())):
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                probability, stored_at = entry
+                if self.ttl is not None and now - stored_at > self.ttl:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                results[i] = probability
+            hits = int(np.count_nonzero(~np.isnan(results)))
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return results
+
+    def store(self, version, keys, probabilities):
+        """Insert freshly scored rows, evicting least recently used entries"""
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(version)
+            for key, probability in zip(map(tuple, keys.tolist()), probabilities):
+                self._entries[key] = (float(probability), now)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "resolution": self.resolution.tolist(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,21 @@
+import os
+import tempfile
+
+def atomic_write(path, writer, mode="wb"):
+    """Write ``path`` through ``writer(f)`` on a temp file in the same directory, then rename it into place.
+
+    Readers see either the previous file or the complete new one, never a
+    partial write. The temp file is removed if ``writer`` fails.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as f:
+            writer(f)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
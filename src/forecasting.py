@@ -0,0 +1,156 @@
+"""Per-field rolling state for streaming irrigation forecasts.
+
+Each field keeps its last ``window`` readings in a fixed-size ring buffer with
+running sums alongside. Adding a reading updates the sums for the reading that
+comes in and the one that falls out of the window. The rolling features are
+the moving averages of moi, temp and humidity, plus the MOI drying rate (the
+least-squares slope of moi over time). Both the update and the features are
+O(1), however long the field has been reporting. ``FieldWindow.project``
+extends the fitted MOI trend to each forecast horizon. It returns moi, temp
+and humidity rows in the shape the serving model scores.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+SECONDS_PER_HOUR = 3600.0
+# Ring buffer columns
+TIMESTAMP, MOI, TEMP, HUMIDITY = range(4)
+
+class FieldWindow:
+    """Ring buffer of one field's most recent readings with running sums"""
+    def __init__(self, capacity):
+        self.capacity = int(capacity)
+        self.buffer = np.zeros((self.capacity, 4))
+        self.count = 0
+        self.next = 0
+        self.updates = 0
+        self.last_reading = None
+        self._origin = None
+        self._reset_sums()
+
+    def _reset_sums(self):
+        # Sums of t, moi, temp, humidity, t*t and t*moi, with t in hours from _origin
+        self.sum_t = self.sum_moi = self.sum_temp = self.sum_humidity = 0.0
+        self.sum_tt = self.sum_tmoi = 0.0
+
+    def _add(self, row, sign):
+        t = (row[TIMESTAMP] - self._origin) / SECONDS_PER_HOUR
+        self.sum_t += sign * t
+        self.sum_moi += sign * row[MOI]
+        self.sum_temp += sign * row[TEMP]
+        self.sum_humidity += sign * row[HUMIDITY]
+        self.sum_tt += sign * t * t
+        self.sum_tmoi += sign * t * row[MOI]
+
+    def oldest(self):
+        return self.buffer[self.next if self.count == self.capacity else 0]
+
+    def push(self, timestamp, moi, temp, humidity):
+        """Add a reading, dropping the oldest once the window is full"""
+        if self.last_reading is not None and timestamp <= self.last_reading[TIMESTAMP]:
+            raise ValueError(
+                f"Reading at {timestamp} is not newer than the last one at {self.last_reading[TIMESTAMP]}"
+            )
+        if self._origin is None:
+            self._origin = timestamp
+        if self.count == self.capacity:
+            self._add(self.buffer[self.next], -1)
+        else:
+            self.count += 1
+        row = self.buffer[self.next]
+        row[:] = (timestamp, moi, temp, humidity)
+        self._add(row, 1)
+        self.last_reading = row.copy()
+        self.next = (self.next + 1) % self.capacity
+        self.updates += 1
+        if self.updates % self.capacity == 0:
+            self._resync()
+
+    def _resync(self):
+        """Recompute the sums from the buffer, re-based on the oldest reading.
+
+        Runs once per ``capacity`` updates, so it stays O(1) amortized. It
+        clears rounding drift from the add/subtract updates and keeps t small,
+        which keeps the slope well conditioned.
+        """
+        self._origin = self.oldest()[TIMESTAMP]
+        self._reset_sums()
+        for row in self.buffer[:self.count]:
+            self._add(row, 1)
+
+    def drying_rate(self):
+        """MOI lost per hour over the window (negative while the soil is wetting)"""
+        n = self.count
+        denominator = n * self.sum_tt - self.sum_t * self.sum_t
+        if n < 2 or denominator <= 1e-12:
+            return 0.0
+        return -(n * self.sum_tmoi - self.sum_t * self.sum_moi) / denominator
+
+    def features(self):
+        n = self.count
+        return {
+            "readings": n,
+            "window_hours": float(self.last_reading[TIMESTAMP] - self.oldest()[TIMESTAMP]) / SECONDS_PER_HOUR,
+            "moi_avg": self.sum_moi / n,
+            "temp_avg": self.sum_temp / n,
+            "humidity_avg": self.sum_humidity / n,
+            "moi_drying_rate": self.drying_rate(),
+        }
+
+    def project(self, horizons):
+        """Expected moi/temp/humidity ``horizons`` hours after the last reading, shape (len(horizons), 3).
+
+        MOI follows the fitted trend line, which is smoother than extrapolating
+        from the latest (noisy) reading, and never goes below zero. Temperature
+        and humidity are held at their moving averages.
+        """
+        n = self.count
+        last_t = (self.last_reading[TIMESTAMP] - self._origin) / SECONDS_PER_HOUR
+        slope = -self.drying_rate()
+        # The least-squares line passes through (mean t, mean moi)
+        moi_now = self.sum_moi / n + slope * (last_t - self.sum_t / n)
+        horizons = np.asarray(horizons, dtype=np.float64)
+        rows = np.empty((len(horizons), 3))
+        rows[:, 0] = np.maximum(moi_now + slope * horizons, 0.0)
+        rows[:, 1] = self.sum_temp / n
+        rows[:, 2] = self.sum_humidity / n
+        return rows
+
+class ForecastStore:
+    """Rolling windows for many fields; the least recently updated field is evicted first"""
+    def __init__(self, window=12, max_fields=10000):
+        self.window = int(window)
+        self.max_fields = int(max_fields)
+        self._fields = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def update(self, field_id, timestamp, moi, temp, humidity, horizons):
+        """Add a reading to its field and return the rolling features and projected rows"""
+        reading = (float(timestamp), float(moi), float(temp), float(humidity))
+        with self._lock:
+            state = self._fields.get(field_id)
+            if state is None:
+                state = self._fields[field_id] = FieldWindow(self.window)
+                while len(self._fields) > self.max_fields:
+                    self._fields.popitem(last=False)
+                    self.evictions += 1
+            state.push(*reading)
+            self._fields.move_to_end(field_id)
+            return state.features(), state.project(horizons)
+
+    def features(self, field_id):
+        """Current rolling features of a field, or None if it has no readings"""
+        with self._lock:
+            state = self._fields.get(field_id)
+            return state.features() if state is not None else None
+
+    def stats(self):
+        return {
+            "fields": len(self._fields),
+            "max_fields": self.max_fields,
+            "window": self.window,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,197 @@
+"""Flattened random forest for fast, shareable inference.
+
+``FlatForest.from_estimator`` packs every tree of a fitted
+RandomForestClassifier into one set of contiguous node arrays (feature,
+threshold, left/right child and leaf class probabilities). ``predict``
+walks all trees for all rows together, one vectorized step per tree level,
+advancing only the (row, tree) pairs that have not reached a leaf yet, and
+returns labels and probabilities from that single pass.
+
+``save`` writes the arrays as .npy files in a directory. ``load`` memory-maps
+them, so uvicorn workers on one host share the same pages through the OS
+page cache instead of each holding its own copy of the forest. The sklearn
+estimator can be saved alongside it; ``estimator`` loads it only when a
+caller asks for it (sklearn's Cython traversal is faster for large batches).
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import joblib
+import numpy as np
+
+ARRAYS = ("feature", "threshold", "left", "right", "leaf_proba", "roots")
+META_FILE = "meta.json"
+ESTIMATOR_FILE = "estimator.joblib"
+
+def fingerprint(estimator):
+    """Content hash of a fitted forest, used to detect stale compiled copies"""
+    digest = hashlib.sha256()
+    for tree in estimator.estimators_:
+        digest.update(np.ascontiguousarray(tree.tree_.threshold).tobytes())
+        digest.update(np.ascontiguousarray(tree.tree_.value).tobytes())
+    return digest.hexdigest()[:16]
+
+class FlatForest:
+    """All trees of a random forest packed into contiguous NumPy arrays"""
+    def __init__(self, feature, threshold, left, right, leaf_proba, roots, classes, max_depth, source=None,
+                 directory=None, n_features=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.classes = np.asarray(classes)
+        self.max_depth = int(max_depth)
+        self.source = source
+        self.directory = directory
+        # Columns the estimator was fitted on; None for forests saved without it
+        self.n_features = None if n_features is None else int(n_features)
+        self._estimator = None
+        self._estimator_lock = threading.Lock()
+
+    @classmethod
+    def from_estimator(cls, estimator):
+        """Compile a fitted RandomForestClassifier (single output)"""
+        features, thresholds, lefts, rights, probas, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for tree in estimator.estimators_:
+            t = tree.tree_
+            n_nodes = t.node_count
+            is_leaf = t.children_left < 0
+            node_ids = np.arange(n_nodes)
+
+            # Leaves point at themselves, which is how traversal recognises them
+            left = np.where(is_leaf, node_ids, t.children_left) + offset
+            right = np.where(is_leaf, node_ids, t.children_right) + offset
+            feature = np.where(is_leaf, 0, t.feature)
+            threshold = np.where(is_leaf, np.inf, t.threshold)
+
+            value = t.value[:, 0, :]
+            totals = value.sum(axis=1, keepdims=True)
+            proba = np.divide(value, totals, out=np.zeros_like(value), where=totals > 0)
+
+            features.append(feature)
+            thresholds.append(threshold)
+            lefts.append(left)
+            rights.append(right)
+            probas.append(proba)
+            roots.append(offset)
+            offset += n_nodes
+            max_depth = max(max_depth, t.max_depth)
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features), dtype=np.int32),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(lefts), dtype=np.int32),
+            right=np.ascontiguousarray(np.concatenate(rights), dtype=np.int32),
+            leaf_proba=np.ascontiguousarray(np.concatenate(probas), dtype=np.float32),
+            roots=np.asarray(roots, dtype=np.int32),
+            classes=estimator.classes_,
+            max_depth=max_depth,
+            source=fingerprint(estimator),
+            n_features=estimator.n_features_in_,
+        )
+
+    def _leaves(self, X):
+        """Leaf node reached in every tree, shape (n_samples, n_trees)"""
+        # sklearn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        if X.ndim != 2:
+            raise ValueError(f"Expected a 2D array of shape (n_samples, n_features), got shape {X.shape}")
+        n_samples, n_features = X.shape
+        # Too few columns would make the flat indexing below read the next row's values
+        if self.n_features is not None and n_features != self.n_features:
+            raise ValueError(f"X has {n_features} features, but FlatForest is expecting {self.n_features} features as input")
+        n_trees = len(self.roots)
+        values = X.ravel()
+
+        # One slot per (tree, row), grouped by tree so each step touches one
+        # tree's nodes at a time; only slots not yet at a leaf are advanced
+        nodes = np.repeat(np.asarray(self.roots, dtype=np.intp), n_samples)
+        row_offsets = np.tile(np.arange(n_samples, dtype=np.intp) * n_features, n_trees)
+        active = np.flatnonzero(self.left[nodes] != nodes)
+        while len(active):
+            current = nodes[active]
+            go_left = values[row_offsets[active] + self.feature[current]] <= self.threshold[current]
+            advanced = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = advanced
+            active = active[self.left[advanced] != advanced]
+        return nodes.reshape(n_trees, n_samples).T
+
+    def predict_proba(self, X):
+        """Class probabilities averaged over trees, as RandomForestClassifier does"""
+        return self.leaf_proba[self._leaves(X)].mean(axis=1, dtype=np.float64)
+
+    def predict(self, X):
+        """Labels and class probabilities from one traversal"""
+        proba = self.predict_proba(X)
+        return self.classes[np.argmax(proba, axis=1)], proba
+
+    def save(self, directory, estimator=None):
+        """Write the arrays as .npy files into a temp directory, then rename it into place.
+
+        ``estimator`` is the fitted sklearn forest, stored for ``estimator()``.
+        """
+        directory = os.path.abspath(directory)
+        parent = os.path.dirname(directory)
+        tmp_dir = tempfile.mkdtemp(dir=parent, prefix=".forest-")
+        try:
+            for name in ARRAYS:
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), getattr(self, name))
+            with open(os.path.join(tmp_dir, META_FILE), "w") as f:
+                json.dump({
+                    "classes": self.classes.tolist(),
+                    "max_depth": self.max_depth,
+                    "source": self.source,
+                    "n_features": self.n_features,
+                }, f)
+            if estimator is not None:
+                joblib.dump(estimator, os.path.join(tmp_dir, ESTIMATOR_FILE))
+            os.chmod(tmp_dir, 0o755)
+            if os.path.isdir(directory):
+                # Directories cannot be swapped with os.replace; move the old one aside first
+                old_dir = tempfile.mkdtemp(dir=parent, prefix=".forest-old-")
+                os.rename(directory, os.path.join(old_dir, "forest"))
+                os.rename(tmp_dir, directory)
+                shutil.rmtree(old_dir)
+            else:
+                os.rename(tmp_dir, directory)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return directory
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Load a saved forest; arrays are memory-mapped read-only by default"""
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r" if mmap else None)
+            for name in ARRAYS
+        }
+        return cls(classes=meta["classes"], max_depth=meta["max_depth"], source=meta.get("source"),
+                   directory=directory, n_features=meta.get("n_features"), **arrays)
+
+    def estimator(self):
+        """The sklearn forest saved next to this one, loaded on first call.
+
+        None when there is no saved estimator or it no longer matches this forest.
+        """
+        if self.directory is None:
+            return None
+        with self._estimator_lock:
+            if self._estimator is None:
+                path = os.path.join(self.directory, ESTIMATOR_FILE)
+                if not os.path.exists(path):
+                    return None
+                estimator = joblib.load(path)
+                # A newer forest may have been saved to the directory since load()
+                self._estimator = estimator if fingerprint(estimator) == self.source else False
+            return self._estimator or None
@@ -2,13 +2,33 @@ from sklearn.ensemble import RandomForestClassifier
 import joblib
 import os
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, roc_auc_score
+from .forest import FlatForest
+from .training import build_keras_model
 
-class IrrigationModel:
-    def __init__(self):
+class BaseIrrigationModel:
+    """Evaluation shared by the model families; subclasses provide predict and predict_proba"""
+    def evaluate(self, X, y):
+        """Evaluate model performance"""
+        predictions = self.predict(X)
+        prob_predictions = self.predict_proba(X)[:, 1]
+        
+        return {
+            'accuracy': accuracy_score(y, predictions),
+            'roc_auc': roc_auc_score(y, prob_predictions),
+            'classification_report': classification_report(y, predictions),
+            'confusion_matrix': confusion_matrix(y, predictions)
+        }
+
+class IrrigationModel(BaseIrrigationModel):
+    def __init__(self, n_estimators=100, max_depth=None, min_samples_leaf=1, n_jobs=None):
         self.model = RandomForestClassifier(
-            n_estimators=100,
+            n_estimators=n_estimators,
+            max_depth=max_depth,
+            min_samples_leaf=min_samples_leaf,
+            n_jobs=n_jobs,
             random_state=42,
             class_weight='balanced'
         )
@@ -25,20 +45,57 @@ class IrrigationModel:
         """Get probability scores"""
         return self.model.predict_proba(X)
     
-    def evaluate(self, X, y):
-        """Evaluate model performance"""
-        predictions = self.predict(X)
-        prob_predictions = self.predict_proba(X)[:, 1]
-        
-        return {
-            'accuracy': accuracy_score(y, predictions),
-            'roc_auc': roc_auc_score(y, prob_predictions),
-            'classification_report': classification_report(y, predictions),
-            'confusion_matrix': confusion_matrix(y, predictions)
-        }
-    
-    def get_feature_importance(self):
+    def get_feature_importance(self, features=None):
         """Get feature importance scores"""
-        features = ['MOI', 'Temperature', 'Humidity', 'Soil Type', 'Seedling Stage']
+        if features is None:
+            features = ['MOI', 'Temperature', 'Humidity', 'Soil Type', 'Seedling Stage']
         importance = self.model.feature_importances_
-        return pd.DataFrame({'feature': features, 'importance': importance})
\ No newline at end of file
+        return pd.DataFrame({'feature': features, 'importance': importance})
+
+    def save_model(self, path):
+        """Save the fitted estimator"""
+        joblib.dump(self.model, path)
+
+    def load_model(self, path):
+        """Load an estimator saved with save_model"""
+        self.model = joblib.load(path)
+
+    def compile_forest(self):
+        """Flattened copy of the forest for single-pass inference"""
+        return FlatForest.from_estimator(self.model)
+
+class DenseIrrigationModel(BaseIrrigationModel):
+    """The /retrain Keras network with the same train/predict/evaluate interface as IrrigationModel"""
+    def __init__(self, units=(32, 16, 8), dropout=0.3, l2=0.01, learning_rate=0.001,
+                 epochs=50, batch_size=32):
+        self.units = tuple(units)
+        self.dropout = dropout
+        self.l2 = l2
+        self.learning_rate = learning_rate
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.model = None
+
+    def train(self, X, y):
+        """Train with the same early stopping as /retrain"""
+        import tensorflow as tf
+
+        self.model = build_keras_model(tf, X.shape[1], self.units, self.dropout, self.l2, self.learning_rate)
+        early_stopping = tf.keras.callbacks.EarlyStopping(
+            monitor='val_loss',
+            patience=5,
+            restore_best_weights=True
+        )
+        self.model.fit(X, y,
+                       epochs=self.epochs,
+                       batch_size=self.batch_size,
+                       validation_split=0.2,
+                       callbacks=[early_stopping],
+                       verbose=0)
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+
+    def predict_proba(self, X):
+        positive = np.asarray(self.model.predict_on_batch(X), dtype=np.float64).reshape(-1)
+        return np.column_stack([1 - positive, positive])
@@ -0,0 +1,159 @@
+"""Pure-NumPy inference for the dense irrigation network.
+
+The Keras model trained by ``/retrain`` is a small stack of Dense layers, so
+serving it does not need TensorFlow. ``export_npz`` writes the layer weights,
+the StandardScaler parameters and the label encoder classes to one ``.npz``
+file, and ``NumpyModel`` runs the forward pass from that file.
+
+Export the current artifact with::
+
+    python -m src.numpy_engine models/cropmodel.pkl models/cropmodel.npz
+"""
+import numpy as np
+
+from .fileio import atomic_write
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+def _sigmoid(x):
+    # Split by sign so large magnitudes never overflow np.exp
+    out = np.empty_like(x)
+    positive = x >= 0
+    out[positive] = 1.0 / (1.0 + np.exp(-x[positive]))
+    exp_x = np.exp(x[~positive])
+    out[~positive] = exp_x / (1.0 + exp_x)
+    return out
+
+def _linear(x):
+    return x
+
+ACTIVATIONS = {
+    "relu": _relu,
+    "sigmoid": _sigmoid,
+    "linear": _linear,
+}
+
+# Layers that carry no weights at inference time
+PASSTHROUGH_LAYERS = ("Dropout", "InputLayer")
+
+class NumpyScaler:
+    """Inference-only stand-in for a fitted StandardScaler"""
+    def __init__(self, mean, scale):
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+class NumpyModel:
+    """Forward pass of an exported Dense network using only NumPy"""
+    def __init__(self, weights, biases, activations, scaler, soil_classes=None, seedling_classes=None):
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+        self.activations = [str(a) for a in activations]
+        self.scaler = scaler
+        self.soil_classes = soil_classes
+        self.seedling_classes = seedling_classes
+        self._activation_fns = [ACTIVATIONS[a] for a in self.activations]
+
+    @classmethod
+    def load(cls, path):
+        """Load an artifact written by export_npz"""
+        with np.load(path, allow_pickle=False) as data:
+            n_layers = int(data["n_layers"])
+            return cls(
+                weights=[data[f"W{i}"] for i in range(n_layers)],
+                biases=[data[f"b{i}"] for i in range(n_layers)],
+                activations=data["activations"].tolist(),
+                scaler=NumpyScaler(data["scaler_mean"], data["scaler_scale"]),
+                soil_classes=data["soil_classes"] if "soil_classes" in data else None,
+                seedling_classes=data["seedling_classes"] if "seedling_classes" in data else None,
+            )
+
+    def predict_on_batch(self, X_scaled):
+        """Score already-scaled features; returns an (n, 1) float32 array like Keras"""
+        x = np.asarray(X_scaled, dtype=np.float32)
+        for W, b, activation in zip(self.weights, self.biases, self._activation_fns):
+            x = activation(x @ W + b)
+        return x
+
+    def predict(self, X_scaled, **kwargs):
+        return self.predict_on_batch(X_scaled)
+
+    def predict_proba(self, X):
+        """Scale raw moi/temp/humidity readings and return P(irrigation) per row"""
+        return self.predict_on_batch(self.scaler.transform(X)).reshape(-1)
+
+def _plain_array(values):
+    """Store string classes as a unicode array; object arrays would need pickle to load"""
+    values = np.asarray(values)
+    return values.astype(str) if values.dtype == object else values
+
+def export_npz(model, scaler, path, le_soil=None, le_seedling=None):
+    """Write a Keras Dense model and its scaler to a compact .npz artifact.
+
+    The file is written next to ``path`` first and renamed into place, so a
+    reader never sees a partially written artifact.
+    """
+    arrays = {
+        "scaler_mean": np.asarray(scaler.mean_, dtype=np.float64),
+        "scaler_scale": np.asarray(scaler.scale_, dtype=np.float64),
+    }
+    activations = []
+    for layer in model.layers:
+        layer_type = type(layer).__name__
+        if layer_type in PASSTHROUGH_LAYERS:
+            continue
+        if layer_type != "Dense":
+            raise ValueError(f"Cannot export layer {layer.name!r} of type {layer_type}")
+        activation = layer.get_config().get("activation", "linear")
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Unsupported activation {activation!r} in layer {layer.name!r}")
+        kernel, bias = layer.get_weights()
+        arrays[f"W{len(activations)}"] = kernel.astype(np.float32)
+        arrays[f"b{len(activations)}"] = bias.astype(np.float32)
+        activations.append(activation)
+
+    arrays["n_layers"] = np.array(len(activations))
+    arrays["activations"] = np.array(activations)
+    if le_soil is not None:
+        arrays["soil_classes"] = _plain_array(le_soil.classes_)
+    if le_seedling is not None:
+        arrays["seedling_classes"] = _plain_array(le_seedling.classes_)
+
+    return atomic_write(path, lambda f: np.savez(f, **arrays))
+
+def compare_with_keras(model, scaler, engine, n_samples=10000, seed=0):
+    """Max absolute difference between Keras and NumPy outputs on random readings"""
+    rng = np.random.default_rng(seed)
+    # Cover the training range and well beyond it
+    X = rng.normal(scaler.mean_, 3 * scaler.scale_, size=(n_samples, len(scaler.mean_)))
+    X_scaled = scaler.transform(X)
+    expected = np.asarray(model.predict_on_batch(X_scaled)).reshape(-1)
+    actual = engine.predict_on_batch(X_scaled).reshape(-1)
+    return float(np.max(np.abs(expected - actual)))
+
+def main():
+    import argparse
+    import joblib
+
+    parser = argparse.ArgumentParser(description="Export the Keras irrigation model to a NumPy .npz artifact")
+    parser.add_argument("source", nargs="?", default="models/cropmodel.pkl")
+    parser.add_argument("target", nargs="?", default="models/cropmodel.npz")
+    parser.add_argument("--atol", type=float, default=1e-5,
+                        help="Maximum allowed difference from the Keras outputs")
+    args = parser.parse_args()
+
+    model_data = joblib.load(args.source)
+    export_npz(model_data["model"], model_data["scaler"], args.target,
+               model_data.get("le_soil"), model_data.get("le_seedling"))
+
+    engine = NumpyModel.load(args.target)
+    max_diff = compare_with_keras(model_data["model"], model_data["scaler"], engine)
+    print(f"Exported {args.source} -> {args.target} (max abs difference vs Keras: {max_diff:.2e})")
+    if max_diff > args.atol:
+        raise SystemExit(f"NumPy outputs differ from Keras by {max_diff:.2e} (> {args.atol:.0e})")
+
+if __name__ == "__main__":
+    main()
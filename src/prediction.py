@@ -1,11 +1,18 @@
 from .preprocessing import IrrigationPreprocessor
 from .model import IrrigationModel
+from .forest import FlatForest
 
 class IrrigationPredictionService:
-    def __init__(self, model_path):
+    def __init__(self, model_path=None, forest_path=None):
         self.preprocessor = IrrigationPreprocessor()
-        self.model = IrrigationModel()
-        self.model.load_model(model_path)
+        # Flattened trees give label and probability from one traversal
+        if forest_path is not None:
+            # Memory-mapped and shared by workers; the sklearn estimator is never loaded
+            self.forest = FlatForest.load(forest_path)
+        else:
+            model = IrrigationModel()
+            model.load_model(model_path)
+            self.forest = model.compile_forest()
         
     def predict_irrigation(self, soil_type, seedling_stage, moi, temp, humidity):
         """Predict irrigation requirement"""
@@ -13,8 +20,9 @@ class IrrigationPredictionService:
             soil_type, seedling_stage, moi, temp, humidity
         )
         
-        prediction = self.model.predict(processed_features)[0]
-        probability = self.model.predict_proba(processed_features)[0]
+        labels, probabilities = self.forest.predict(processed_features)
+        prediction = labels[0]
+        probability = probabilities[0]
         
         return {
             'needs_irrigation': bool(prediction),
@@ -3,11 +3,14 @@ import numpy as np
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split
 
+NUMERIC_INPUTS = ['moi', 'temp', 'humidity']
+
 class IrrigationPreprocessor:
     def __init__(self):
         self.scaler = StandardScaler()
         self.soil_encoder = LabelEncoder()
         self.seedling_encoder = LabelEncoder()
+        self._lookups = {}
         
     def load_data(self, filepath='data/cropdata_updated.csv'):
         """Load irrigation dataset"""
@@ -32,15 +35,60 @@ class IrrigationPreprocessor:
         
         return X_scaled, y
     
+    def _lookup(self, encoder):
+        """Hash table from category to code, rebuilt only when the encoder is refitted"""
+        classes = encoder.classes_
+        cached = self._lookups.get(id(encoder))
+        if cached is None or cached[0] is not classes:
+            cached = (classes, pd.Index(classes))
+            self._lookups[id(encoder)] = cached
+        return cached[1]
+
+    def _encode(self, encoder, values, name, errors):
+        """Vectorized LabelEncoder.transform; unknown values are reported per row"""
+        codes = self._lookup(encoder).get_indexer(values)
+        for row in np.flatnonzero(codes < 0):
+            errors.setdefault(int(row), f"Unknown {name} {values[row]!r}")
+        return codes
+
+    def prepare_batch(self, data):
+        """Prepare many inputs for prediction in one pass.
+
+        ``data`` is a DataFrame or a mapping of equal-length columns named
+        soil_type, seedling_stage, moi, temp and humidity. Returns a float32
+        array of shape (n, 5) in the same column order as
+        prepare_single_prediction, and a dict mapping the positions of rows
+        with unknown categories to an error message. Those rows are filled
+        with NaN.
+        """
+        soil_types = np.asarray(data['soil_type'], dtype=object)
+        seedling_stages = np.asarray(data['seedling_stage'], dtype=object)
+        n_rows = len(soil_types)
+
+        features = np.empty((n_rows, 5), dtype=np.float32)
+        for i, column in enumerate(NUMERIC_INPUTS):
+            features[:, i] = data[column]
+        # Scale numerics in place: (x - mean) / scale
+        features[:, :3] -= self.scaler.mean_.astype(np.float32)
+        features[:, :3] /= self.scaler.scale_.astype(np.float32)
+
+        errors = {}
+        features[:, 3] = self._encode(self.soil_encoder, soil_types, 'soil_type', errors)
+        features[:, 4] = self._encode(self.seedling_encoder, seedling_stages, 'seedling_stage', errors)
+        if errors:
+            features[list(errors)] = np.nan
+
+        return features, errors
+
     def prepare_single_prediction(self, soil_type, seedling_stage, moi, temp, humidity):
         """Prepare single input for prediction"""
-        # Encode categorical inputs
-        soil_encoded = self.soil_encoder.transform([soil_type])[0]
-        seedling_encoded = self.seedling_encoder.transform([seedling_stage])[0]
-        
-        # Create and scale features
-        features = np.array([[moi, temp, humidity, soil_encoded, seedling_encoded]])
-        features_scaled = features.copy()
-        features_scaled[:, :3] = self.scaler.transform(features[:, :3])
-        
-        return features_scaled
\ No newline at end of file
+        features, errors = self.prepare_batch({
+            'soil_type': [soil_type],
+            'seedling_stage': [seedling_stage],
+            'moi': [moi],
+            'temp': [temp],
+            'humidity': [humidity]
+        })
+        if errors:
+            raise ValueError(errors[0])
+        return features
@@ -0,0 +1,111 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class LoadedModel:
+    """One loaded version of the model artifacts"""
+    def __init__(self, data, version, path, mtime_ns, size):
+        self.data = data
+        self.version = version
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.loaded_at = time.time()
+
+def file_version(path, chunk_size=1 << 20):
+    """Short content hash used as the model version"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+class ModelRegistry:
+    """Keep the serving artifacts in memory and reload them only when they change.
+
+    ``get`` is called on every request. It stats the artifact at most once per
+    ``check_interval`` seconds. When the mtime or size changed, it starts a
+    background thread to re-hash and reload the file and returns the current
+    version straight away. A reload builds the new model fully before swapping
+    the reference, and callers keep using the previous version until then, so
+    requests never wait on or fail during a reload. ``reload`` is the blocking
+    variant for callers that need the new version before they return.
+    """
+
+    def __init__(self, loader, path, check_interval=2.0):
+        self.loader = loader
+        self.path = path
+        self.check_interval = check_interval
+        self.reloads_total = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self._current = None
+        self.reload(force=True)
+
+    def get(self):
+        """Current model, reloaded first if the artifact changed on disk"""
+        now = time.monotonic()
+        if self.check_interval is not None and now - self._last_check >= self.check_interval:
+            self._last_check = now
+            if self._changed_on_disk() and self._lock.acquire(blocking=False):
+                # Unpickling can take seconds and get() runs on the event loop,
+                # so the reload happens in the background; the thread releases
+                # the lock, which keeps other callers from starting a second one
+                threading.Thread(target=self._background_reload, name="model-reload", daemon=True).start()
+        return self._current
+
+    def _background_reload(self):
+        try:
+            self._reload_locked(force=False)
+        finally:
+            self._lock.release()
+
+    def _changed_on_disk(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        current = self._current
+        return stat.st_mtime_ns != current.mtime_ns or stat.st_size != current.size
+
+    def reload(self, force=False):
+        """Reload the artifact now; unless forced, skip it when the content hash is unchanged"""
+        with self._lock:
+            return self._reload_locked(force)
+
+    def _reload_locked(self, force):
+        try:
+            stat = os.stat(self.path)
+            version = file_version(self.path)
+            current = self._current
+            if not force and current is not None and version == current.version:
+                # Touched but identical; remember the new mtime so we stop re-hashing
+                current.mtime_ns, current.size = stat.st_mtime_ns, stat.st_size
+                return current
+            data = self.loader()
+        except Exception as e:
+            self.last_error = str(e)
+            if self._current is None:
+                raise
+            logger.error("Error reloading model from %s: %s", self.path, e)
+            return self._current
+
+        self._current = LoadedModel(data, version, self.path, stat.st_mtime_ns, stat.st_size)
+        self.reloads_total += 1
+        self.last_error = None
+        return self._current
+
+    def info(self):
+        current = self._current
+        return {
+            "model_version": current.version,
+            "artifact": current.path,
+            "loaded_at": current.loaded_at,
+            "reloads_total": self.reloads_total,
+            "last_reload_error": self.last_error
+        }
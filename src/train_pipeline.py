@@ -0,0 +1,226 @@
+"""Cross-validated hyperparameter search over both model families.
+
+Every (family, hyperparameters, fold) combination is trained in parallel on
+all CPU cores with joblib. The StandardScaler is fitted once per fold and the
+scaled fold arrays are shared by every candidate. Each candidate is reported
+with BaseIrrigationModel.evaluate() metrics, training time and inference
+latency, and the best one by ``accuracy - latency_weight * single_row_ms`` is
+refitted on the full dataset and saved as the serving artifact.
+
+    python -m src.train_pipeline data/train/cropdata_updated.csv --folds 5 --report models/search.json
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from .model import DenseIrrigationModel, IrrigationModel
+from .numpy_engine import export_npz
+from .training import NUMERICAL_FEATURES, TARGET, binary_target, dump_atomic
+
+MODEL_FAMILIES = {
+    "random_forest": IrrigationModel,
+    "dense": DenseIrrigationModel,
+}
+
+SEARCH_SPACE = {
+    "random_forest": [
+        {"n_estimators": n_estimators, "max_depth": max_depth, "min_samples_leaf": min_samples_leaf}
+        for n_estimators, max_depth, min_samples_leaf in itertools.product([50, 100, 200], [None, 10, 20], [1, 5])
+    ],
+    "dense": [
+        {"units": units, "dropout": dropout, "l2": l2}
+        for units, dropout, l2 in itertools.product([(32, 16, 8), (16, 8)], [0.2, 0.3], [0.01, 0.001])
+    ],
+}
+
+# Single-row latency is the median of this many predict_proba calls on the
+# serving path (the FlatForest for random forests)
+LATENCY_CALLS = 50
+
+def load_dataset(csv_path):
+    """Numeric features, binary target and the raw frame of a training CSV"""
+    df = pd.read_csv(csv_path)
+    X = df[NUMERICAL_FEATURES].to_numpy(dtype=np.float64)
+    y = binary_target(df[TARGET]).astype(int)
+    return df, X, y
+
+def make_folds(X, y, n_folds=5, seed=42):
+    """Scale each fold once so every candidate reuses the same preprocessing"""
+    folds = []
+    splitter = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed)
+    for train_idx, val_idx in splitter.split(X, y):
+        scaler = StandardScaler().fit(X[train_idx])
+        folds.append((
+            scaler.transform(X[train_idx]).astype(np.float32), y[train_idx],
+            scaler.transform(X[val_idx]).astype(np.float32), y[val_idx]
+        ))
+    return folds
+
+def _limit_worker_threads():
+    """One candidate per core, so keep each model single-threaded"""
+    try:
+        import tensorflow as tf
+        tf.config.threading.set_intra_op_parallelism_threads(1)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+    except (ImportError, RuntimeError):
+        # RuntimeError: TF was already initialised in this worker
+        pass
+
+def evaluate_candidate(family, params, fold_index, fold):
+    """Train one candidate on one fold; runs in a joblib worker"""
+    if family == "dense":
+        _limit_worker_threads()
+    X_train, y_train, X_val, y_val = fold
+    model = MODEL_FAMILIES[family](**params)
+
+    started = time.perf_counter()
+    model.train(X_train, y_train)
+    train_seconds = time.perf_counter() - started
+
+    metrics = model.evaluate(X_val, y_val)
+
+    # Time what the API serves: forests are scored through their flattened copy
+    scorer = model.compile_forest() if family == "random_forest" else model
+
+    started = time.perf_counter()
+    scorer.predict_proba(X_val)
+    batch_seconds = time.perf_counter() - started
+
+    single_row = X_val[:1]
+    scorer.predict_proba(single_row)
+    timings = []
+    for _ in range(LATENCY_CALLS):
+        started = time.perf_counter()
+        scorer.predict_proba(single_row)
+        timings.append(time.perf_counter() - started)
+
+    return {
+        "family": family,
+        "params": params,
+        "fold": fold_index,
+        "accuracy": float(metrics['accuracy']),
+        "roc_auc": float(metrics['roc_auc']),
+        "confusion_matrix": np.asarray(metrics['confusion_matrix']).tolist(),
+        "train_seconds": train_seconds,
+        "batch_us_per_row": 1e6 * batch_seconds / len(X_val),
+        "single_row_ms": 1000.0 * float(np.median(timings)),
+    }
+
+def summarize(fold_results, latency_weight=0.0, max_latency_ms=None):
+    """Average fold results per candidate and rank them by the trade-off score"""
+    grouped = {}
+    for result in fold_results:
+        key = (result["family"], json.dumps(result["params"], sort_keys=True))
+        grouped.setdefault(key, []).append(result)
+
+    candidates = []
+    for (family, _), results in grouped.items():
+        accuracy = np.array([r["accuracy"] for r in results])
+        single_row_ms = float(np.mean([r["single_row_ms"] for r in results]))
+        candidates.append({
+            "family": family,
+            "params": results[0]["params"],
+            "folds": len(results),
+            "accuracy_mean": float(accuracy.mean()),
+            "accuracy_std": float(accuracy.std()),
+            "roc_auc_mean": float(np.mean([r["roc_auc"] for r in results])),
+            "train_seconds_mean": float(np.mean([r["train_seconds"] for r in results])),
+            "batch_us_per_row_mean": float(np.mean([r["batch_us_per_row"] for r in results])),
+            "single_row_ms_mean": single_row_ms,
+            "eligible": max_latency_ms is None or single_row_ms <= max_latency_ms,
+            "score": float(accuracy.mean()) - latency_weight * single_row_ms,
+        })
+    # Best score first; ties go to the faster model
+    candidates.sort(key=lambda c: (not c["eligible"], -c["score"], c["single_row_ms_mean"]))
+    return candidates
+
+def fit_serving_artifact(best, df, X, y):
+    """Refit the winning candidate on all rows and build the artifact dict the API loads"""
+    scaler = StandardScaler().fit(X)
+    model = MODEL_FAMILIES[best["family"]](**best["params"])
+    model.train(scaler.transform(X).astype(np.float32), y)
+    le_soil = LabelEncoder().fit(df['soil_type'])
+    le_seedling = LabelEncoder().fit(df['Seedling Stage'])
+    return {
+        # The API serves the raw Keras model; main() swaps the forest for its flat copy
+        'model': model.model if best["family"] == "dense" else model,
+        'scaler': scaler,
+        'le_soil': le_soil,
+        'le_seedling': le_seedling
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-validated hyperparameter search for the irrigation model")
+    parser.add_argument("csv_path", help="Training CSV with MOI, temp, humidity, soil_type, Seedling Stage and result")
+    parser.add_argument("--families", nargs="+", choices=list(MODEL_FAMILIES), default=list(MODEL_FAMILIES))
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Parallel workers (-1 uses every core)")
+    parser.add_argument("--latency-weight", type=float, default=0.0,
+                        help="Accuracy given up per millisecond of single-row latency when ranking")
+    parser.add_argument("--max-latency-ms", type=float, help="Exclude candidates slower than this per row")
+    parser.add_argument("--output", default=os.getenv("MODEL_PATH", "models/cropmodel.pkl"))
+    parser.add_argument("--numpy-output", default=os.getenv("NUMPY_MODEL_PATH", "models/cropmodel.npz"))
+    parser.add_argument("--forest-output", default=os.getenv("FOREST_PATH", "models/cropmodel_forest"),
+                        help="Directory for the memory-mappable compiled forest")
+    parser.add_argument("--report", help="Write every fold and candidate result to this JSON file")
+    parser.add_argument("--dry-run", action="store_true", help="Search only; do not save the best model")
+    args = parser.parse_args()
+
+    df, X, y = load_dataset(args.csv_path)
+    folds = make_folds(X, y, args.folds)
+    tasks = [
+        (family, params, i)
+        for family in args.families
+        for params in SEARCH_SPACE[family]
+        for i in range(len(folds))
+    ]
+    print(f"Evaluating {len(tasks)} fits ({len(tasks) // len(folds)} candidates x {len(folds)} folds)")
+
+    fold_results = Parallel(n_jobs=args.n_jobs, verbose=0)(
+        delayed(evaluate_candidate)(family, params, i, folds[i]) for family, params, i in tasks
+    )
+    candidates = summarize(fold_results, args.latency_weight, args.max_latency_ms)
+
+    print(f"{'family':<14}{'accuracy':>10}{'roc_auc':>9}{'train s':>9}{'1-row ms':>10}{'us/row':>8}  params")
+    for c in candidates:
+        print(f"{c['family']:<14}{c['accuracy_mean']:>10.4f}{c['roc_auc_mean']:>9.4f}"
+              f"{c['train_seconds_mean']:>9.2f}{c['single_row_ms_mean']:>10.3f}"
+              f"{c['batch_us_per_row_mean']:>8.1f}  {c['params']}{'' if c['eligible'] else '  (too slow)'}")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"candidates": candidates, "folds": fold_results}, f, indent=2)
+
+    best = candidates[0]
+    if not best["eligible"]:
+        raise SystemExit(f"No candidate meets --max-latency-ms {args.max_latency_ms}")
+    print(f"Best: {best['family']} {best['params']} (accuracy {best['accuracy_mean']:.4f})")
+    if args.dry_run:
+        return
+
+    artifact = fit_serving_artifact(best, df, X, y)
+    if best["family"] == "random_forest":
+        # The API serves the memory-mapped flat forest; the pickle only records
+        # which forest it pairs with. Written first so a reload finds it
+        model = artifact.pop('model')
+        forest = model.compile_forest()
+        forest.save(args.forest_output, estimator=model.model)
+        artifact['forest_source'] = forest.source
+        print(f"Saved {args.forest_output}")
+    dump_atomic(artifact, args.output)
+    print(f"Saved {args.output}")
+    if best["family"] == "dense":
+        export_npz(artifact['model'], artifact['scaler'], args.numpy_output,
+                   artifact['le_soil'], artifact['le_seedling'])
+        print(f"Saved {args.numpy_output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+import fcntl
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from .fileio import atomic_write
+from .numpy_engine import export_npz
+
+NUMERICAL_FEATURES = ['MOI', 'temp', 'humidity']
+TARGET = 'result'
+MAX_EPOCHS = 50
+BATCH_SIZE = 32
+VALIDATION_SPLIT = 0.2
+# Rows parsed per read_csv chunk; bounds peak memory regardless of file size
+CSV_CHUNK_ROWS = 100_000
+# Rows carried from one chunk into the next when shuffling training batches
+SHUFFLE_BUFFER_ROWS = 100_000
+CSV_DTYPES = {'MOI': np.float32, 'temp': np.float32, 'humidity': np.float32, TARGET: np.int8}
+
+def build_keras_model(tf, n_features=len(NUMERICAL_FEATURES), units=(32, 16, 8), dropout=0.3,
+                      l2=0.01, learning_rate=0.001):
+    """Dense network with regularization; the defaults are the one /retrain trains"""
+    layers = [tf.keras.Input(shape=(n_features,))]
+    for width in units:
+        layers.append(tf.keras.layers.Dense(width, activation='relu',
+                                            kernel_regularizer=tf.keras.regularizers.l2(l2)))
+        layers.append(tf.keras.layers.Dropout(dropout))
+    layers.append(tf.keras.layers.Dense(1, activation='sigmoid'))
+
+    model = tf.keras.Sequential(layers)
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate),
+                 loss='binary_crossentropy',
+                 metrics=['accuracy'])
+    return model
+
+def binary_target(result):
+    """Any non-zero result means the field needed water"""
+    return (np.asarray(result) > 0).astype(np.int8)
+
+def iter_csv_chunks(csv_path, chunksize=CSV_CHUNK_ROWS):
+    """Read only the training columns of a CSV, one typed chunk at a time"""
+    return pd.read_csv(csv_path, usecols=list(CSV_DTYPES), dtype=CSV_DTYPES, chunksize=chunksize)
+
+def fit_scaler_streaming(csv_path, chunksize=CSV_CHUNK_ROWS):
+    """Fit a StandardScaler chunk by chunk; returns the scaler and the row count"""
+    scaler = StandardScaler()
+    n_rows = 0
+    for chunk in iter_csv_chunks(csv_path, chunksize):
+        scaler.partial_fit(chunk[NUMERICAL_FEATURES].to_numpy(np.float64))
+        n_rows += len(chunk)
+    return scaler, n_rows
+
+def iter_scaled_batches(csv_path, scaler, start, stop, batch_size=BATCH_SIZE, rng=None,
+                        shuffle_rows=SHUFFLE_BUFFER_ROWS, chunksize=CSV_CHUNK_ROWS):
+    """Yield scaled (X, y) batches for rows [start, stop) of the CSV.
+
+    Every batch has ``batch_size`` rows except the last one, so there are
+    always ceil((stop - start) / batch_size) batches. When ``rng`` is given,
+    rows go through a shuffle buffer that carries ``shuffle_rows`` random rows
+    over into the next chunk. Batches then mix rows from neighbouring chunks,
+    and the order differs from one epoch to the next.
+    """
+    keep = shuffle_rows if rng is not None else 0
+    X_pool = np.empty((0, len(NUMERICAL_FEATURES)), dtype=np.float32)
+    y_pool = np.empty(0, dtype=np.float32)
+    offset = 0
+    for chunk in iter_csv_chunks(csv_path, chunksize):
+        lo, hi = max(start - offset, 0), min(stop - offset, len(chunk))
+        offset += len(chunk)
+        if lo < hi:
+            X = scaler.transform(chunk[NUMERICAL_FEATURES].to_numpy(np.float64)[lo:hi]).astype(np.float32)
+            X_pool = np.concatenate([X_pool, X])
+            y_pool = np.concatenate([y_pool, binary_target(chunk[TARGET].to_numpy()[lo:hi]).astype(np.float32)])
+            if rng is not None:
+                order = rng.permutation(len(X_pool))
+                X_pool, y_pool = X_pool[order], y_pool[order]
+            n_out = max(len(X_pool) - keep, 0) // batch_size * batch_size
+            for i in range(0, n_out, batch_size):
+                yield X_pool[i:i + batch_size], y_pool[i:i + batch_size]
+            X_pool, y_pool = X_pool[n_out:], y_pool[n_out:]
+        if offset >= stop:
+            break
+
+    for i in range(0, len(X_pool), batch_size):
+        yield X_pool[i:i + batch_size], y_pool[i:i + batch_size]
+
+def train_keras_model(csv_path, callbacks=()):
+    """Fit the scaler and Keras model on a CSV file without loading it whole.
+
+    The scaler is fitted with partial_fit over typed chunks, then Keras is fed
+    through a tf.data pipeline that re-reads the file each epoch. As with
+    ``validation_split``, the last 20% of rows are held out for validation.
+    """
+    import tensorflow as tf
+
+    scaler, n_rows = fit_scaler_streaming(csv_path)
+    n_train = int(n_rows * (1 - VALIDATION_SPLIT))
+    if n_train == 0 or n_train == n_rows:
+        raise ValueError(f"Need at least 2 rows to train with a validation split, got {n_rows}")
+
+    rng = np.random.default_rng()
+    output_signature = (
+        tf.TensorSpec(shape=(None, len(NUMERICAL_FEATURES)), dtype=tf.float32),
+        tf.TensorSpec(shape=(None,), dtype=tf.float32)
+    )
+
+    def dataset(start, stop, rng=None):
+        # Declaring the batch count lets Keras size the epoch up front
+        # instead of reporting that the input ran out of data
+        n_batches = -(-(stop - start) // BATCH_SIZE)
+        return tf.data.Dataset.from_generator(
+            lambda: iter_scaled_batches(csv_path, scaler, start, stop, BATCH_SIZE, rng),
+            output_signature=output_signature
+        ).apply(tf.data.experimental.assert_cardinality(n_batches)).prefetch(tf.data.AUTOTUNE)
+
+    model = build_keras_model(tf)
+
+    # Add early stopping to prevent overfitting
+    early_stopping = tf.keras.callbacks.EarlyStopping(
+        monitor='val_loss',
+        patience=5,
+        restore_best_weights=True
+    )
+
+    history = model.fit(dataset(0, n_train, rng),
+                      validation_data=dataset(n_train, n_rows),
+                      epochs=MAX_EPOCHS,
+                      shuffle=False,  # iter_scaled_batches shuffles
+                      callbacks=[early_stopping, *callbacks],
+                      verbose=0)
+    return model, scaler, history
+
+def dump_atomic(obj, path):
+    """joblib.dump to a temp file next to path, then rename it into place"""
+    return atomic_write(path, lambda f: joblib.dump(obj, f))
+
+def run_retrain_job(job_id, csv_path, model_path, numpy_model_path, le_soil, le_seedling, progress_queue):
+    """Train and save new artifacts; runs inside the worker process"""
+    import tensorflow as tf
+
+    class ProgressCallback(tf.keras.callbacks.Callback):
+        def on_epoch_end(self, epoch, logs=None):
+            metrics = {k: float(v) for k, v in (logs or {}).items()}
+            progress_queue.put((job_id, epoch + 1, metrics))
+
+    model, scaler, history = train_keras_model(csv_path, [ProgressCallback()])
+
+    # Save model and scaler
+    model_data = {
+        'model': model,
+        'scaler': scaler,
+        'le_soil': le_soil,
+        'le_seedling': le_seedling
+    }
+    dump_atomic(model_data, model_path)
+    export_npz(model, scaler, numpy_model_path, le_soil, le_seedling)
+
+    epochs = [
+        {"epoch": i + 1, **{k: float(v[i]) for k, v in history.history.items()}}
+        for i in range(len(history.history['loss']))
+    ]
+    return {
+        "history": {
+            "accuracy": float(history.history['accuracy'][-1]),
+            "val_accuracy": float(history.history['val_accuracy'][-1])
+        },
+        "epochs": epochs
+    }
+
+class RetrainInProgress(RuntimeError):
+    """A retraining job is already running in this or another worker"""
+    def __init__(self, job_id):
+        super().__init__(f"Retraining job {job_id} is already running")
+        self.job_id = job_id
+
+# Job IDs are uuid4 hex strings; anything else never names a status file
+JOB_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+class RetrainJobManager:
+    """Run retraining jobs in a separate process and track their progress.
+
+    Jobs run in a process pool so training never competes with request
+    handling for the GIL. Per-epoch metrics are streamed back through a
+    manager queue, and ``on_complete`` is called once the new artifacts are
+    on disk so the caller can swap in the new model.
+
+    Job status is kept as one JSON file per job in ``state_dir`` (next to the
+    model artifact by default). Every uvicorn worker on the host can therefore
+    answer a status request. An exclusive ``flock`` on ``active.lock`` allows
+    one job at a time across all workers. The kernel releases the lock when
+    its owner exits, so a job whose worker died is reported as failed instead
+    of staying "running" forever.
+    """
+
+    def __init__(self, model_path, numpy_model_path, on_complete=None, state_dir=None):
+        self.model_path = model_path
+        self.numpy_model_path = numpy_model_path
+        self.on_complete = on_complete
+        self.state_dir = state_dir or os.path.join(os.path.dirname(os.path.abspath(model_path)), "retrain_jobs")
+        self.lock_path = os.path.join(self.state_dir, "active.lock")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._lock_file = None
+        self._executor = None
+        self._manager = None
+        self._progress = None
+        self._progress_thread = None
+
+    def _ensure_started(self):
+        if self._executor is not None:
+            return
+        # spawn keeps the worker free of the parent's TensorFlow/thread state
+        context = multiprocessing.get_context("spawn")
+        self._manager = context.Manager()
+        self._progress = self._manager.Queue()
+        self._executor = ProcessPoolExecutor(max_workers=1, mp_context=context)
+        self._progress_thread = threading.Thread(
+            target=self._drain_progress, name="retrain-progress", daemon=True
+        )
+        self._progress_thread.start()
+
+    def _job_path(self, job_id):
+        return os.path.join(self.state_dir, f"{job_id}.json")
+
+    def _write_job(self, job):
+        """Atomically replace a job's status file; call with self._lock held"""
+        atomic_write(self._job_path(job["job_id"]), lambda f: json.dump(job, f), mode="w")
+
+    def _read_job(self, job_id):
+        if not JOB_ID_PATTERN.fullmatch(job_id):
+            return None
+        try:
+            with open(self._job_path(job_id)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _acquire_job_lock(self, job_id):
+        """Take the host-wide job lock or raise RetrainInProgress"""
+        os.makedirs(self.state_dir, exist_ok=True)
+        lock_file = open(self.lock_path, "a+")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.seek(0)
+            running = lock_file.read().strip()
+            lock_file.close()
+            raise RetrainInProgress(running or "unknown")
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(job_id)
+        lock_file.flush()
+        self._lock_file = lock_file
+
+    def _release_job_lock(self):
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    def active_job(self):
+        """ID of the job running in any worker, or None"""
+        try:
+            with open(self.lock_path) as f:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return f.read().strip() or "unknown"
+                fcntl.flock(f, fcntl.LOCK_UN)
+                return None
+        except FileNotFoundError:
+            return None
+
+    def _drain_progress(self):
+        while True:
+            try:
+                message = self._progress.get()
+            except (EOFError, OSError):
+                return
+            if message is None:
+                return
+            job_id, epoch, metrics = message
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job["status"] in ("completed", "failed"):
+                    continue
+                job["status"] = "running"
+                job["epoch"] = epoch
+                job["epochs"].append({"epoch": epoch, **metrics})
+                self._write_job(job)
+
+    def submit(self, csv_path, le_soil, le_seedling):
+        """Queue a retraining job for a CSV file on disk; returns its status.
+
+        Raises RetrainInProgress if any worker is already retraining.
+        """
+        with self._lock:
+            job_id = uuid.uuid4().hex
+            self._acquire_job_lock(job_id)
+            try:
+                self._ensure_started()
+                job = self._jobs[job_id] = {
+                    "job_id": job_id,
+                    "status": "queued",
+                    "epoch": 0,
+                    "max_epochs": MAX_EPOCHS,
+                    "epochs": [],
+                    "history": None,
+                    "error": None,
+                    "submitted_at": time.time(),
+                    "finished_at": None
+                }
+                self._write_job(job)
+                future = self._executor.submit(
+                    run_retrain_job, job_id, csv_path, self.model_path, self.numpy_model_path,
+                    le_soil, le_seedling, self._progress
+                )
+            except BaseException:
+                self._jobs.pop(job_id, None)
+                self._release_job_lock()
+                raise
+        future.add_done_callback(lambda f: self._finish(job_id, csv_path, f))
+        return self.get(job_id)
+
+    def _finish(self, job_id, csv_path, future):
+        try:
+            result = future.result()
+            if self.on_complete is not None:
+                self.on_complete()
+        except (Exception, CancelledError) as e:
+            update = {"status": "failed", "error": str(e) or type(e).__name__}
+        else:
+            update = {
+                "status": "completed",
+                "epoch": len(result["epochs"]),
+                "epochs": result["epochs"],
+                "history": result["history"]
+            }
+        finally:
+            if os.path.exists(csv_path):
+                os.remove(csv_path)
+        with self._lock:
+            job = self._jobs.pop(job_id)
+            job.update(update, finished_at=time.time())
+            # Final status is on disk before the lock lets another job start
+            self._write_job(job)
+            self._release_job_lock()
+
+    def get(self, job_id):
+        """Status of a job started by any worker, or None for unknown IDs"""
+        job = self._read_job(job_id)
+        if job is None or job["status"] in ("completed", "failed"):
+            return job
+        if self.active_job() is None:
+            # The lock is released only after the final status is written,
+            # so re-read before concluding the owning worker died
+            job = self._read_job(job_id)
+            if job["status"] not in ("completed", "failed"):
+                job.update(status="failed", error="Worker exited before the job finished")
+        return job
+
+    def shutdown(self):
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        try:
+            self._progress.put(None)
+        except (EOFError, OSError):
+            pass
+        self._progress_thread.join(timeout=5)
+        self._manager.shutdown()
+        self._executor = None
+        self._manager = None
+        self._progress = None
+        self._progress_thread = None
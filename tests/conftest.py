@@ -0,0 +1,17 @@
+import os
+
+import pytest
+
+@pytest.fixture(scope="session")
+def app_module():
+    # The NumPy backend serves the shipped model without importing TensorFlow
+    os.environ.setdefault("MODEL_BACKEND", "numpy")
+    from src import app
+    return app
+
+@pytest.fixture
+def client(app_module):
+    from fastapi.testclient import TestClient
+
+    with TestClient(app_module.app) as client:
+        yield client
@@ -0,0 +1,115 @@
+import json
+
+READINGS = [
+    {"moi": 5.0, "temp": 30.0, "humidity": 50.0, "soil_type": "Red Soil", "seedling_stage": "Harvest"},
+    {"moi": 50.0, "temp": 25.0, "humidity": 60.0, "soil_type": "Black Soil", "seedling_stage": "Seedling"},
+    {"moi": 95.0, "temp": 20.0, "humidity": 80.0, "soil_type": "Red Soil", "seedling_stage": "Harvest"},
+]
+CSV_HEADER = "moi,temp,humidity,soil_type,seedling_stage\n"
+
+def to_csv(readings):
+    return CSV_HEADER + "".join(
+        f"{r['moi']},{r['temp']},{r['humidity']},{r['soil_type']},{r['seedling_stage']}\n" for r in readings
+    )
+
+def to_ndjson(readings):
+    return "\n".join(json.dumps(r) for r in readings) + "\n"
+
+def test_json_batch_matches_single_predictions(client):
+    response = client.post("/predict/batch", json=READINGS)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 3
+    for reading, prediction in zip(READINGS, body["predictions"]):
+        single = client.post("/predict", json=reading).json()
+        assert abs(prediction["confidence"] - single["confidence"]) < 1e-6
+        assert prediction["input_parameters"] == reading
+
+def test_csv_and_ndjson_bodies_match_json(client):
+    expected = client.post("/predict/batch", json=READINGS).json()
+
+    csv = client.post("/predict/batch", content=to_csv(READINGS), headers={"content-type": "text/csv"})
+    ndjson = client.post("/predict/batch", content=to_ndjson(READINGS),
+                         headers={"content-type": "application/x-ndjson"})
+
+    assert csv.status_code == 200
+    assert ndjson.status_code == 200
+    assert csv.json() == expected
+    assert ndjson.json() == expected
+
+def test_empty_batch(client):
+    response = client.post("/predict/batch", json=[])
+
+    assert response.status_code == 200
+    assert response.json() == {"count": 0, "predictions": []}
+
+def test_csv_blank_cells_are_rejected(client):
+    body = CSV_HEADER + "35,29,61,Red Soil,Harvest\n,29,61,Red Soil,Harvest\n40,30,,Red Soil,Harvest\n"
+
+    response = client.post("/predict/batch", content=body, headers={"content-type": "text/csv"})
+
+    assert response.status_code == 422
+    locations = [error["loc"] for error in response.json()["detail"]]
+    assert locations == [[1, "moi"], [2, "humidity"]]
+    assert all("input" not in error for error in response.json()["detail"])
+
+def test_csv_blank_category_is_not_nan(client):
+    body = CSV_HEADER + "35,29,61,,Harvest\n"
+
+    response = client.post("/predict/batch", content=body, headers={"content-type": "text/csv"})
+
+    assert response.status_code == 200
+    assert response.json()["predictions"][0]["input_parameters"]["soil_type"] == ""
+
+def test_csv_missing_column(client):
+    response = client.post("/predict/batch", content="moi,temp\n1,2\n", headers={"content-type": "text/csv"})
+
+    assert response.status_code == 422
+    assert "humidity" in response.json()["detail"]
+
+def test_non_finite_numbers_are_rejected(client):
+    body = to_ndjson(READINGS[:1]) + '{"moi": NaN, "temp": 1, "humidity": 1, "soil_type": "a", "seedling_stage": "b"}\n'
+
+    ndjson = client.post("/predict/batch", content=body, headers={"content-type": "application/x-ndjson"})
+    csv = client.post("/predict/batch", content=CSV_HEADER + "inf,29,61,Red Soil,Harvest\n",
+                      headers={"content-type": "text/csv"})
+
+    assert ndjson.status_code == 422
+    assert ndjson.json()["detail"][0]["loc"] == [1, "moi"]
+    assert csv.status_code == 422
+
+def test_invalid_json_is_a_bad_request(client):
+    response = client.post("/predict/batch", content="[{bad", headers={"content-type": "application/json"})
+
+    assert response.status_code == 400
+
+def test_non_array_json_is_rejected(client):
+    response = client.post("/predict/batch", json=READINGS[0])
+
+    assert response.status_code == 422
+
+def test_oversize_batch(client, app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "MAX_BATCH_SIZE", 2)
+
+    for content, content_type in [
+        (json.dumps(READINGS), "application/json"),
+        (to_csv(READINGS), "text/csv"),
+        (to_ndjson(READINGS), "application/x-ndjson"),
+    ]:
+        response = client.post("/predict/batch", content=content, headers={"content-type": content_type})
+        assert response.status_code == 413
+
+def test_readings_without_a_cache_key_bypass_the_cache(client, app_module, monkeypatch):
+    from src.cache import PredictionCache
+
+    monkeypatch.setattr(app_module, "prediction_cache", PredictionCache())
+    huge = dict(READINGS[0], moi=1e19)
+
+    response = client.post("/predict/batch", json=[READINGS[0], huge])
+    cached = client.post("/predict/batch", json=[READINGS[0]])
+
+    assert response.status_code == 200
+    assert response.json()["count"] == 2
+    assert app_module.prediction_cache.stats()["size"] == 1
+    assert cached.json()["predictions"][0]["confidence"] == response.json()["predictions"][0]["confidence"]
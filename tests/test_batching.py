@@ -0,0 +1,122 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from src.batching import MicroBatcher
+
+class RecordingPredictor:
+    """predict_fn stub that returns the first feature of each row and records batch sizes"""
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, features):
+        self.batches.append(len(features))
+        return features[:, 0] / 100.0
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+def test_flushes_when_batch_is_full():
+    predictor = RecordingPredictor()
+
+    async def scenario():
+        # A wait far longer than the test, so only the size limit can flush
+        batcher = MicroBatcher(predictor, max_batch_size=4, max_wait_ms=60_000)
+        await batcher.start()
+        results = await asyncio.wait_for(
+            asyncio.gather(*[batcher.submit([i, 0, 0]) for i in range(8)]), timeout=5
+        )
+        await batcher.stop()
+        return results, batcher.stats()
+
+    results, stats = run(scenario())
+
+    assert results == [i / 100.0 for i in range(8)]
+    assert predictor.batches == [4, 4]
+    assert stats["batches_total"] == 2
+    assert stats["batch_size_histogram"]["le_4"] == 2
+
+def test_flushes_after_max_wait():
+    predictor = RecordingPredictor()
+
+    async def scenario():
+        batcher = MicroBatcher(predictor, max_batch_size=100, max_wait_ms=20)
+        await batcher.start()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        results = await asyncio.gather(*[batcher.submit([i, 0, 0]) for i in range(3)])
+        elapsed = loop.time() - started
+        await batcher.stop()
+        return results, elapsed
+
+    results, elapsed = run(scenario())
+
+    assert results == [0.0, 0.01, 0.02]
+    assert predictor.batches == [3]
+    assert 0.015 <= elapsed < 1.0
+
+def test_predict_errors_reach_every_caller():
+    def failing(features):
+        raise ValueError("model exploded")
+
+    async def scenario():
+        batcher = MicroBatcher(failing, max_batch_size=3, max_wait_ms=50)
+        await batcher.start()
+        results = await asyncio.gather(*[batcher.submit([i, 0, 0]) for i in range(3)], return_exceptions=True)
+        await batcher.stop()
+        return results, batcher.stats()
+
+    results, stats = run(scenario())
+
+    assert all(isinstance(r, ValueError) and str(r) == "model exploded" for r in results)
+    assert stats["errors_total"] == 1
+
+def test_cancelled_callers_are_skipped():
+    predictor = RecordingPredictor()
+
+    async def scenario():
+        batcher = MicroBatcher(predictor, max_batch_size=10, max_wait_ms=50)
+        await batcher.start()
+        tasks = [asyncio.create_task(batcher.submit([i, 0, 0])) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks[1].cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        await batcher.stop()
+        return results
+
+    results = run(scenario())
+
+    assert results[0] == 0.0 and results[2] == 0.02
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert predictor.batches == [2]
+
+def test_stop_fails_queued_and_in_flight_readings():
+    release = threading.Event()
+
+    def blocking(features):
+        release.wait(5)
+        return np.zeros(len(features))
+
+    async def scenario():
+        batcher = MicroBatcher(blocking, max_batch_size=1, max_wait_ms=0)
+        await batcher.start()
+        tasks = [asyncio.create_task(batcher.submit([i, 0, 0])) for i in range(3)]
+        # The first row is being scored, the others are still queued
+        await asyncio.sleep(0.05)
+        await batcher.stop()
+        results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=5)
+        release.set()
+        return results, batcher.running
+
+    results, running = run(scenario())
+
+    assert not running
+    assert all(isinstance(r, RuntimeError) and "stopped" in str(r) for r in results)
+
+def test_submit_requires_running_batcher():
+    batcher = MicroBatcher(RecordingPredictor())
+
+    with pytest.raises(RuntimeError):
+        run(batcher.submit([1, 2, 3]))
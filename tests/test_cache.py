@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from src import cache as cache_module
+from src.cache import PredictionCache
+
+def keys_for(cache, rows):
+    keys, _ = cache.quantize(np.asarray(rows, dtype=np.float64))
+    return keys
+
+def test_quantize_snaps_to_resolution():
+    cache = PredictionCache(resolution=(1.0, 1.0, 0.1))
+
+    keys, snapped = cache.quantize([[35.4, 29.6, 61.04]])
+
+    assert keys.tolist() == [[35, 30, 610]]
+    np.testing.assert_allclose(snapped, [[35.0, 30.0, 61.0]])
+
+def test_hits_and_misses():
+    cache = PredictionCache()
+    keys = keys_for(cache, [[35, 29, 61], [40, 30, 50]])
+    cache.store("v1", keys[:1], [0.7])
+
+    result = cache.lookup("v1", keys)
+
+    assert result[0] == 0.7
+    assert np.isnan(result[1])
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_size=2)
+    keys = keys_for(cache, [[1, 1, 1], [2, 2, 2], [3, 3, 3]])
+    cache.store("v1", keys[:2], [0.1, 0.2])
+    cache.lookup("v1", keys[:1])
+
+    cache.store("v1", keys[2:], [0.3])
+
+    result = cache.lookup("v1", keys)
+    assert result[0] == 0.1
+    assert np.isnan(result[1])
+    assert result[2] == 0.3
+    assert cache.evictions == 1
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = PredictionCache(ttl=10)
+    keys = keys_for(cache, [[35, 29, 61]])
+    cache.store("v1", keys, [0.7])
+
+    now[0] += 5
+    assert cache.lookup("v1", keys)[0] == 0.7
+    now[0] += 6
+    assert np.isnan(cache.lookup("v1", keys)[0])
+    assert cache.stats()["size"] == 0
+
+def test_new_model_version_clears_cache():
+    cache = PredictionCache()
+    keys = keys_for(cache, [[35, 29, 61]])
+    cache.store("v1", keys, [0.7])
+
+    assert np.isnan(cache.lookup("v2", keys)[0])
+    assert cache.invalidations == 1
+    assert cache.stats()["size"] == 0
+
+def test_non_finite_readings_are_rejected():
+    cache = PredictionCache()
+
+    for bad in (np.nan, np.inf, -np.inf, 1e300):
+        assert cache.cacheable([[35, 29, 61], [35, bad, 61]]).tolist() == [True, False]
+        with pytest.raises(ValueError, match=r"rows \[1\]"):
+            cache.quantize([[35, 29, 61], [35, bad, 61]])
+    assert cache.stats()["size"] == 0
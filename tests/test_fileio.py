@@ -0,0 +1,27 @@
+import pytest
+
+from src.fileio import atomic_write
+
+def test_replaces_file(tmp_path):
+    path = tmp_path / "artifact.bin"
+    path.write_bytes(b"old")
+
+    atomic_write(str(path), lambda f: f.write(b"new"))
+
+    assert path.read_bytes() == b"new"
+    assert oct(path.stat().st_mode & 0o777) == "0o644"
+    assert [p.name for p in tmp_path.iterdir()] == ["artifact.bin"]
+
+def test_failed_write_keeps_old_file_and_removes_temp(tmp_path):
+    path = tmp_path / "status.json"
+    path.write_text("old")
+
+    def failing(f):
+        f.write("partial")
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        atomic_write(str(path), failing, mode="w")
+
+    assert path.read_text() == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["status.json"]
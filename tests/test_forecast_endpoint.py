@@ -0,0 +1,50 @@
+import json
+
+def reading(field_id, hour, moi):
+    return {
+        "field_id": field_id, "timestamp": f"2026-06-01T{hour:02d}:00:00Z",
+        "moi": moi, "temp": 30.0, "humidity": 50.0, "soil_type": "Red Soil", "seedling_stage": "Harvest",
+    }
+
+def stream(client, lines):
+    response = client.post("/forecast/stream", content="\n".join(lines) + "\n",
+                           headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def test_stream_returns_one_forecast_per_reading(client):
+    results = stream(client, [json.dumps(reading("stream-a", hour, 60 - 5 * hour)) for hour in range(3)])
+
+    assert [r["field_id"] for r in results] == ["stream-a"] * 3
+    assert [r["rolling"]["readings"] for r in results] == [1, 2, 3]
+    assert client.get("/forecast/stream-a").json()["rolling"]["readings"] == 3
+
+def test_malformed_lines_do_not_end_the_stream(client):
+    results = stream(client, [
+        json.dumps(reading("stream-b", 0, 40)),
+        '{"field_id": "stream-b", "moi": ',
+        json.dumps(dict(reading("stream-b", 1, 38), moi="NaN")),
+        json.dumps(dict(reading("stream-b", 2, 36), soil_type=None)),
+        json.dumps(reading("stream-b", 0, 35)),
+        json.dumps(reading("stream-b", 3, 34)),
+    ])
+
+    assert len(results) == 6
+    assert results[0]["rolling"]["readings"] == 1
+    assert results[1]["error"][0]["type"] == "json_invalid"
+    assert results[2]["error"][0]["loc"] == ["moi"]
+    assert results[3]["error"][0]["loc"] == ["soil_type"]
+    assert all("input" not in error for r in results[1:4] for error in r["error"])
+    # Out of order for its field: a per-line error, not a validation error
+    assert results[4]["field_id"] == "stream-b" and "not newer" in results[4]["error"]
+    assert results[5]["rolling"]["readings"] == 2
+
+def test_websocket_answers_every_message(client):
+    with client.websocket_connect("/forecast/ws") as websocket:
+        websocket.send_text("not json")
+        error = websocket.receive_json()
+        websocket.send_text(json.dumps(reading("socket-a", 0, 40)))
+        forecast = websocket.receive_json()
+
+    assert error["error"][0]["type"] == "json_invalid"
+    assert forecast["field_id"] == "socket-a"
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from src.forecasting import FieldWindow, ForecastStore
+
+BASE = 1_700_000_000.0
+
+def least_squares_drying_rate(times, moi):
+    hours = (np.asarray(times) - times[0]) / 3600.0
+    return -np.polyfit(hours, moi, 1)[0]
+
+def test_moving_averages_and_drying_rate_over_window():
+    window = FieldWindow(capacity=4)
+    readings = [(BASE + i * 1800, 60 - 2 * i, 25 + i, 50 - i) for i in range(6)]
+    for reading in readings:
+        window.push(*reading)
+
+    kept = np.array(readings[-4:])
+    features = window.features()
+    assert features["readings"] == 4
+    assert features["window_hours"] == pytest.approx(1.5)
+    assert features["moi_avg"] == pytest.approx(kept[:, 1].mean())
+    assert features["temp_avg"] == pytest.approx(kept[:, 2].mean())
+    assert features["humidity_avg"] == pytest.approx(kept[:, 3].mean())
+    assert features["moi_drying_rate"] == pytest.approx(4.0)
+
+def test_running_sums_match_recomputation_over_long_streams():
+    rng = np.random.default_rng(0)
+    window = FieldWindow(capacity=12)
+    times = BASE + np.cumsum(rng.uniform(60, 3600, size=5000))
+    moi = rng.uniform(0, 100, size=5000)
+    for t, m in zip(times, moi):
+        window.push(t, m, 30.0, 50.0)
+
+    features = window.features()
+    assert features["moi_avg"] == pytest.approx(moi[-12:].mean(), abs=1e-9)
+    assert features["moi_drying_rate"] == pytest.approx(least_squares_drying_rate(times[-12:], moi[-12:]), rel=1e-6)
+
+def test_single_reading_has_no_drying_rate():
+    window = FieldWindow(capacity=4)
+    window.push(BASE, 40, 25, 60)
+
+    assert window.features()["moi_drying_rate"] == 0.0
+    np.testing.assert_allclose(window.project([1, 3]), [[40, 25, 60], [40, 25, 60]])
+
+def test_projection_follows_trend_and_stops_at_zero():
+    window = FieldWindow(capacity=4)
+    for i in range(4):
+        window.push(BASE + i * 3600, 30 - 5 * i, 30, 50)
+
+    rows = window.project([1, 3])
+
+    np.testing.assert_allclose(rows[:, 0], [10, 0])
+    np.testing.assert_allclose(rows[:, 1:], [[30, 50], [30, 50]])
+
+def test_out_of_order_reading_is_rejected():
+    window = FieldWindow(capacity=4)
+    window.push(BASE, 40, 25, 60)
+
+    with pytest.raises(ValueError):
+        window.push(BASE, 39, 25, 60)
+    assert window.features()["readings"] == 1
+
+def test_store_evicts_least_recently_updated_field():
+    store = ForecastStore(window=4, max_fields=2)
+    store.update("a", BASE, 40, 25, 60, [1])
+    store.update("b", BASE, 40, 25, 60, [1])
+    store.update("a", BASE + 60, 39, 25, 60, [1])
+
+    store.update("c", BASE, 40, 25, 60, [1])
+
+    assert store.features("b") is None
+    assert store.features("a")["readings"] == 2
+    assert store.stats()["evictions"] == 1
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.forest import FlatForest, fingerprint
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2000, 5))
+    y = (X[:, 0] + 0.5 * X[:, 1] ** 2 - X[:, 2] + rng.normal(scale=0.5, size=2000) > 0.3).astype(int)
+    return X, y
+
+@pytest.fixture(scope="module")
+def estimator(data):
+    X, y = data
+    return RandomForestClassifier(n_estimators=30, min_samples_leaf=2, random_state=0).fit(X, y)
+
+@pytest.fixture(scope="module")
+def X_test():
+    # Includes values far outside the training range
+    return np.random.default_rng(1).normal(scale=3.0, size=(500, 5))
+
+def test_matches_sklearn(estimator, X_test):
+    forest = FlatForest.from_estimator(estimator)
+
+    np.testing.assert_allclose(forest.predict_proba(X_test), estimator.predict_proba(X_test), atol=1e-6)
+    labels, proba = forest.predict(X_test)
+    np.testing.assert_array_equal(labels, estimator.predict(X_test))
+    np.testing.assert_allclose(proba, estimator.predict_proba(X_test), atol=1e-6)
+
+def test_single_row_matches_sklearn(estimator, X_test):
+    forest = FlatForest.from_estimator(estimator)
+
+    for row in X_test[:20]:
+        np.testing.assert_allclose(forest.predict_proba(row[None, :]), estimator.predict_proba(row[None, :]), atol=1e-6)
+
+def test_multiclass_labels(data):
+    X, _ = data
+    y = np.digitize(X[:, 0], [-0.5, 0.5])
+    estimator = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    forest = FlatForest.from_estimator(estimator)
+
+    labels, proba = forest.predict(X)
+    np.testing.assert_array_equal(labels, estimator.predict(X))
+    np.testing.assert_allclose(proba, estimator.predict_proba(X), atol=1e-6)
+
+def test_save_and_load_memory_mapped(estimator, X_test, tmp_path):
+    forest = FlatForest.from_estimator(estimator)
+    forest.save(tmp_path / "forest")
+
+    loaded = FlatForest.load(tmp_path / "forest")
+
+    assert isinstance(loaded.left, np.memmap)
+    assert loaded.source == fingerprint(estimator)
+    np.testing.assert_array_equal(loaded.predict_proba(X_test), forest.predict_proba(X_test))
+
+def test_save_replaces_existing_directory(data, estimator, tmp_path):
+    X, y = data
+    other = RandomForestClassifier(n_estimators=5, random_state=1).fit(X, y)
+    FlatForest.from_estimator(other).save(tmp_path / "forest")
+
+    FlatForest.from_estimator(estimator).save(tmp_path / "forest")
+
+    assert FlatForest.load(tmp_path / "forest").source == fingerprint(estimator)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["forest"]
+
+def test_estimator_is_loaded_lazily(estimator, X_test, tmp_path):
+    FlatForest.from_estimator(estimator).save(tmp_path / "forest", estimator=estimator)
+    loaded = FlatForest.load(tmp_path / "forest")
+
+    assert loaded._estimator is None
+    np.testing.assert_array_equal(loaded.estimator().predict_proba(X_test), estimator.predict_proba(X_test))
+
+def test_estimator_missing_or_stale(data, estimator, tmp_path):
+    X, y = data
+    FlatForest.from_estimator(estimator).save(tmp_path / "forest")
+    assert FlatForest.load(tmp_path / "forest").estimator() is None
+
+    loaded = FlatForest.load(tmp_path / "forest")
+    # Another forest is saved to the directory after this one was loaded
+    other = RandomForestClassifier(n_estimators=5, random_state=1).fit(X, y)
+    FlatForest.from_estimator(other).save(tmp_path / "forest", estimator=other)
+    assert loaded.estimator() is None
+
+def test_wrong_number_of_columns_is_rejected(estimator, X_test, tmp_path):
+    forest = FlatForest.from_estimator(estimator)
+    forest.save(tmp_path / "forest")
+    loaded = FlatForest.load(tmp_path / "forest")
+
+    assert loaded.n_features == 5
+    for model in (forest, loaded):
+        with pytest.raises(ValueError, match="X has 4 features, but FlatForest is expecting 5"):
+            model.predict_proba(X_test[:, :4])
+        with pytest.raises(ValueError, match="X has 6 features"):
+            model.predict(np.hstack([X_test, X_test[:, :1]]))
+        with pytest.raises(ValueError, match="2D array"):
+            model.predict_proba(X_test[0])
+
+def test_serving_keeps_large_batches_on_the_flat_forest_by_default(app_module, estimator, X_test, tmp_path, monkeypatch):
+    from sklearn.preprocessing import StandardScaler
+
+    FlatForest.from_estimator(estimator).save(tmp_path / "forest", estimator=estimator)
+    forest = FlatForest.load(tmp_path / "forest")
+    current = {'forest': forest, 'scaler': StandardScaler(with_mean=False, with_std=False).fit(X_test)}
+
+    app_module.score_features(current, X_test)
+    assert forest._estimator is None
+
+    monkeypatch.setattr(app_module, "FLAT_FOREST_MAX_BATCH", 100)
+    app_module.score_features(current, X_test[:100])
+    assert forest._estimator is None
+    np.testing.assert_allclose(app_module.score_features(current, X_test), estimator.predict_proba(X_test)[:, 1])
+    assert forest._estimator is not None
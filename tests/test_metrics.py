@@ -0,0 +1,73 @@
+import math
+
+import pytest
+
+from src.metrics import MetricsRegistry
+
+def sample(text, line_prefix):
+    """Value of the exposition line starting with ``line_prefix``, or 0 if absent"""
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ["stage"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, stage="score")
+
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{stage="score",le="0.1"} 2',
+        'latency_seconds_bucket{stage="score",le="1.0"} 3',
+        'latency_seconds_bucket{stage="score",le="+Inf"} 4',
+        'latency_seconds_sum{stage="score"} 3.65',
+        'latency_seconds_count{stage="score"} 4',
+    ]
+
+def test_counter_and_gauge_escape_label_values():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ["endpoint"])
+    gauge = registry.gauge("temperature", "Temperature")
+    counter.inc(endpoint='say "hi"\\\n')
+    counter.inc(2, endpoint='say "hi"\\\n')
+    gauge.set(math.inf)
+
+    lines = registry.render().splitlines()
+
+    assert 'requests_total{endpoint="say \\"hi\\"\\\\\\n"} 3.0' in lines
+    assert "temperature +Inf" in lines
+
+def test_labels_must_match_declared_names():
+    counter = MetricsRegistry().counter("requests_total", "Requests", ["endpoint"])
+
+    with pytest.raises(ValueError):
+        counter.inc(route="/predict")
+
+def test_collectors_run_before_render():
+    registry = MetricsRegistry()
+    gauge = registry.gauge("queue_depth", "Queue depth")
+    registry.add_collector(lambda: gauge.set(7))
+
+    assert "queue_depth 7.0" in registry.render().splitlines()
+
+def test_requests_and_errors_are_counted_per_route_template(client):
+    route = 'endpoint="/retrain/{job_id}",method="GET",status="404"'
+    before = client.get("/metrics").text
+
+    for job_id in ("a" * 32, "b" * 32, "not-a-job"):
+        assert client.get(f"/retrain/{job_id}").status_code == 404
+    client.get("/no-such-route")
+    after = client.get("/metrics").text
+
+    assert sample(after, f"irrigation_requests_total{{{route}}}") - sample(before, f"irrigation_requests_total{{{route}}}") == 3
+    assert sample(after, f"irrigation_request_errors_total{{{route}}}") - sample(before, f"irrigation_request_errors_total{{{route}}}") == 3
+    assert "a" * 32 not in after
+    unmatched = 'endpoint="unmatched",method="GET",status="404"'
+    assert sample(after, f"irrigation_request_errors_total{{{unmatched}}}") - sample(before, f"irrigation_request_errors_total{{{unmatched}}}") == 1
+    # The first /metrics call is counted by the time the second one renders
+    assert sample(after, 'irrigation_requests_total{endpoint="/metrics",method="GET",status="200"}') >= 1
+    assert 'irrigation_request_errors_total{endpoint="/metrics"' not in after
+    assert sample(after, 'irrigation_request_duration_seconds_count{endpoint="/retrain/{job_id}",method="GET"}') >= 3
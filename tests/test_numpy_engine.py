@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("tensorflow")
+joblib = pytest.importorskip("joblib")
+
+from src.numpy_engine import NumpyModel, compare_with_keras, export_npz
+
+MODEL_PATH = "models/cropmodel.pkl"
+ATOL = 1e-5
+
+@pytest.fixture(scope="module")
+def model_data():
+    return joblib.load(MODEL_PATH)
+
+def test_exported_model_matches_keras(model_data, tmp_path):
+    path = export_npz(model_data["model"], model_data["scaler"], str(tmp_path / "model.npz"),
+                      model_data["le_soil"], model_data["le_seedling"])
+    engine = NumpyModel.load(path)
+
+    assert compare_with_keras(model_data["model"], model_data["scaler"], engine) <= ATOL
+
+    readings = np.array([[0.0, 10.0, 20.0], [45.0, 30.0, 60.0], [95.0, 45.0, 95.0]])
+    scaled = model_data["scaler"].transform(readings)
+    expected = np.asarray(model_data["model"].predict_on_batch(scaled)).reshape(-1)
+    np.testing.assert_allclose(engine.predict_proba(readings), expected, atol=ATOL)
+
+def test_exported_classes_load_without_pickle(model_data, tmp_path):
+    path = export_npz(model_data["model"], model_data["scaler"], str(tmp_path / "model.npz"),
+                      model_data["le_soil"], model_data["le_seedling"])
+    engine = NumpyModel.load(path)
+
+    np.testing.assert_array_equal(engine.soil_classes, model_data["le_soil"].classes_)
+    np.testing.assert_array_equal(engine.seedling_classes, model_data["le_seedling"].classes_)
+
+def test_shipped_npz_matches_shipped_keras_model(model_data):
+    engine = NumpyModel.load("models/cropmodel.npz")
+
+    assert compare_with_keras(model_data["model"], model_data["scaler"], engine) <= ATOL
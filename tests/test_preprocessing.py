@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.preprocessing import IrrigationPreprocessor
+
+SOILS = ['Alluvial Soil', 'Black Soil', 'Chalky Soil', 'Clay Soil', 'Loam Soil', 'Red Soil', 'Sandy Soil']
+STAGES = ['Germination', 'Flowering', 'Harvest', 'Seedling Stage', 'Vegetative Growth / Root or Tuber Development']
+
+def training_frame(soils=SOILS, stages=STAGES, n_rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'soil_type': rng.choice(soils, n_rows),
+        'Seedling Stage': rng.choice(stages, n_rows),
+        'MOI': rng.uniform(0, 100, n_rows),
+        'temp': rng.uniform(10, 45, n_rows),
+        'humidity': rng.uniform(10, 90, n_rows),
+        'result': rng.integers(0, 2, n_rows),
+    })
+
+def request_columns(frame):
+    return {
+        'soil_type': frame['soil_type'].tolist(),
+        'seedling_stage': frame['Seedling Stage'].tolist(),
+        'moi': frame['MOI'].to_numpy(),
+        'temp': frame['temp'].to_numpy(),
+        'humidity': frame['humidity'].to_numpy(),
+    }
+
+@pytest.fixture
+def preprocessor():
+    preprocessor = IrrigationPreprocessor()
+    preprocessor.preprocess_data(training_frame())
+    return preprocessor
+
+def test_batch_matches_label_encoder_and_scaler(preprocessor):
+    frame = training_frame(seed=1, n_rows=50)
+
+    features, errors = preprocessor.prepare_batch(request_columns(frame))
+
+    assert errors == {}
+    assert features.dtype == np.float32 and features.shape == (50, 5)
+    expected_numeric = preprocessor.scaler.transform(frame[['MOI', 'temp', 'humidity']])
+    np.testing.assert_allclose(features[:, :3], expected_numeric, rtol=1e-5, atol=1e-5)
+    np.testing.assert_array_equal(features[:, 3], preprocessor.soil_encoder.transform(frame['soil_type']))
+    np.testing.assert_array_equal(features[:, 4], preprocessor.seedling_encoder.transform(frame['Seedling Stage']))
+
+def test_unknown_categories_are_reported_per_row(preprocessor):
+    frame = training_frame(seed=1, n_rows=4)
+    columns = request_columns(frame)
+    columns['soil_type'][1] = 'Peat Soil'
+    columns['seedling_stage'][3] = 'Dormant'
+    columns['soil_type'][3] = 'Peat Soil'
+
+    features, errors = preprocessor.prepare_batch(columns)
+
+    assert errors == {1: "Unknown soil_type 'Peat Soil'", 3: "Unknown soil_type 'Peat Soil'"}
+    assert np.isnan(features[[1, 3]]).all()
+    assert not np.isnan(features[[0, 2]]).any()
+
+def test_lookup_follows_a_refit(preprocessor):
+    columns = {'soil_type': ['Red Soil'], 'seedling_stage': ['Harvest'], 'moi': [40], 'temp': [30], 'humidity': [50]}
+    before, _ = preprocessor.prepare_batch(columns)
+
+    preprocessor.preprocess_data(training_frame(soils=['Red Soil', 'Peat Soil'], stages=['Harvest', 'Dormant']))
+    after, errors = preprocessor.prepare_batch(dict(columns, soil_type=['Peat Soil']))
+
+    assert before[0, 3] == SOILS.index('Red Soil')
+    assert errors == {}
+    assert after[0, 3] == list(preprocessor.soil_encoder.classes_).index('Peat Soil')
+    assert after[0, 4] == list(preprocessor.seedling_encoder.classes_).index('Harvest')
+
+def test_single_prediction_raises_for_unknown_category(preprocessor):
+    features = preprocessor.prepare_single_prediction('Red Soil', 'Harvest', 40, 30, 50)
+    assert features.shape == (1, 5)
+
+    with pytest.raises(ValueError, match=r"^Unknown seedling_stage 'Dormant'$"):
+        preprocessor.prepare_single_prediction('Red Soil', 'Dormant', 40, 30, 50)
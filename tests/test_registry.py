@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+
+import pytest
+
+from src.registry import ModelRegistry
+
+class FileLoader:
+    """Stub loader returning the artifact's text; can be gated or made to fail"""
+    def __init__(self, path):
+        self.path = path
+        self.calls = 0
+        self.gate = None
+        self.error = None
+
+    def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+        with open(self.path) as f:
+            return f.read()
+
+def write(path, text, mtime_offset=0):
+    with open(path, "w") as f:
+        f.write(text)
+    # Move the mtime forward so the change is seen even on coarse timestamps
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset))
+
+def join_reloads():
+    for thread in threading.enumerate():
+        if thread.name == "model-reload":
+            thread.join(5)
+
+@pytest.fixture
+def artifact(tmp_path):
+    path = str(tmp_path / "model.pkl")
+    write(path, "v1")
+    return path
+
+def test_get_keeps_serving_old_version_until_reload_finishes(artifact):
+    loader = FileLoader(artifact)
+    registry = ModelRegistry(loader, artifact, check_interval=0)
+    first = registry.get()
+    loader.gate = threading.Event()
+    write(artifact, "v2", mtime_offset=10**9)
+
+    started = time.perf_counter()
+    during = registry.get()
+    elapsed = time.perf_counter() - started
+    # A second caller while the reload runs neither blocks nor starts another one
+    also_during = registry.get()
+    loader.gate.set()
+    join_reloads()
+
+    assert elapsed < 0.5
+    assert during is first and also_during is first
+    assert during.data == "v1"
+    assert registry.get().data == "v2"
+    assert registry.get().version != first.version
+    assert loader.calls == 2
+    assert registry.reloads_total == 2
+
+def test_touched_file_with_same_content_is_not_reloaded(artifact):
+    loader = FileLoader(artifact)
+    registry = ModelRegistry(loader, artifact, check_interval=0)
+    first = registry.get()
+
+    write(artifact, "v1", mtime_offset=10**9)
+    registry.get()
+    join_reloads()
+
+    assert registry.get() is first
+    assert loader.calls == 1
+    assert first.mtime_ns == os.stat(artifact).st_mtime_ns
+    assert registry.reloads_total == 1
+
+def test_failed_reload_keeps_old_version(artifact):
+    loader = FileLoader(artifact)
+    registry = ModelRegistry(loader, artifact, check_interval=0)
+    first = registry.get()
+
+    loader.error = ValueError("truncated pickle")
+    write(artifact, "v2", mtime_offset=10**9)
+    registry.get()
+    join_reloads()
+
+    assert registry.get() is first
+    assert registry.last_error == "truncated pickle"
+    assert registry.info()["last_reload_error"] == "truncated pickle"
+
+    loader.error = None
+    assert registry.reload().data == "v2"
+    assert registry.last_error is None
+
+def test_failed_initial_load_raises(artifact):
+    loader = FileLoader(artifact)
+    loader.error = ValueError("no model")
+
+    with pytest.raises(ValueError):
+        ModelRegistry(loader, artifact)
+
+def test_check_interval_throttles_stat_calls(artifact):
+    loader = FileLoader(artifact)
+    registry = ModelRegistry(loader, artifact, check_interval=3600)
+    registry._last_check = time.monotonic()
+
+    write(artifact, "v2", mtime_offset=10**9)
+    registry.get()
+    join_reloads()
+
+    assert registry.get().data == "v1"
+    assert registry.reload().data == "v2"
@@ -0,0 +1,162 @@
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from src import training
+from src.training import RetrainInProgress, RetrainJobManager
+
+def start_in_threads(self):
+    """Stand-in for _ensure_started that runs jobs in a thread instead of a spawned process"""
+    if self._executor is not None:
+        return
+    self._manager = SimpleNamespace(shutdown=lambda: None)
+    self._progress = queue.Queue()
+    self._executor = ThreadPoolExecutor(max_workers=1)
+    self._progress_thread = threading.Thread(target=self._drain_progress, daemon=True)
+    self._progress_thread.start()
+
+@pytest.fixture
+def job_release(monkeypatch):
+    """Stub run_retrain_job that reports two epochs, then waits until released"""
+    release = threading.Event()
+
+    def fake_job(job_id, csv_path, model_path, numpy_model_path, le_soil, le_seedling, progress_queue):
+        for epoch in (1, 2):
+            progress_queue.put((job_id, epoch, {"loss": 1.0 / epoch}))
+        if not release.wait(5):
+            raise RuntimeError("test never released the job")
+        if le_soil == "fail":
+            raise ValueError("bad training data")
+        return {"history": {"accuracy": 0.9, "val_accuracy": 0.8},
+                "epochs": [{"epoch": 1, "loss": 1.0}, {"epoch": 2, "loss": 0.5}]}
+
+    monkeypatch.setattr(training, "run_retrain_job", fake_job)
+    monkeypatch.setattr(RetrainJobManager, "_ensure_started", start_in_threads)
+    return release
+
+@pytest.fixture
+def managers(tmp_path):
+    """Two managers sharing one state directory, like two uvicorn workers"""
+    completed = []
+    make = lambda: RetrainJobManager(str(tmp_path / "model.pkl"), str(tmp_path / "model.npz"),
+                                     on_complete=lambda: completed.append(True))
+    first, second = make(), make()
+    yield first, second, completed
+    first.shutdown()
+    second.shutdown()
+
+def upload(tmp_path, name="upload.csv"):
+    path = tmp_path / name
+    path.write_text("MOI,temp,humidity,result\n1,2,3,0\n")
+    return str(path)
+
+def wait_for(manager, job_id, statuses):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job stayed {job['status']}")
+
+def wait_until_idle(manager):
+    # The final status is written just before the job lock is released
+    deadline = time.monotonic() + 5
+    while manager.active_job() is not None:
+        assert time.monotonic() < deadline, "job lock was never released"
+        time.sleep(0.01)
+
+def test_status_is_visible_from_other_workers(tmp_path, managers, job_release):
+    first, second, completed = managers
+    csv_path = upload(tmp_path)
+
+    job = first.submit(csv_path, None, None)
+    running = wait_for(second, job["job_id"], {"running"})
+    while len(running["epochs"]) < 2:
+        running = second.get(job["job_id"])
+    job_release.set()
+    done = wait_for(second, job["job_id"], {"completed", "failed"})
+
+    assert job["status"] in ("queued", "running")
+    assert [e["epoch"] for e in running["epochs"]] == [1, 2]
+    assert done["status"] == "completed"
+    assert done["history"] == {"accuracy": 0.9, "val_accuracy": 0.8}
+    assert completed == [True]
+    assert not os.path.exists(csv_path)
+    wait_until_idle(second)
+
+def test_one_job_at_a_time_across_workers(tmp_path, managers, job_release):
+    first, second, _ = managers
+    job = first.submit(upload(tmp_path), None, None)
+
+    with pytest.raises(RetrainInProgress) as excinfo:
+        second.submit(upload(tmp_path, "second.csv"), None, None)
+    assert excinfo.value.job_id == job["job_id"]
+    assert second.active_job() == job["job_id"]
+
+    job_release.set()
+    wait_for(first, job["job_id"], {"completed"})
+    wait_until_idle(second)
+    next_job = second.submit(upload(tmp_path, "third.csv"), None, None)
+    assert next_job["job_id"] != job["job_id"]
+    job_release.set()
+    wait_for(second, next_job["job_id"], {"completed"})
+
+def test_failed_job_reports_error(tmp_path, managers, job_release):
+    first, second, completed = managers
+    job_release.set()
+
+    job = first.submit(upload(tmp_path), "fail", None)
+    done = wait_for(second, job["job_id"], {"completed", "failed"})
+
+    assert done["status"] == "failed"
+    assert done["error"] == "bad training data"
+    assert completed == []
+    wait_until_idle(second)
+
+def test_job_of_a_dead_worker_is_reported_failed(tmp_path, managers):
+    first, second, _ = managers
+    os.makedirs(first.state_dir)
+    job_id = "a" * 32
+    with open(os.path.join(first.state_dir, f"{job_id}.json"), "w") as f:
+        json.dump({"job_id": job_id, "status": "running", "epoch": 3, "error": None}, f)
+
+    # Nobody holds the job lock, so the worker that owned the job is gone
+    job = second.get(job_id)
+
+    assert job["status"] == "failed"
+    assert "exited" in job["error"]
+
+def test_running_job_is_not_reported_failed_while_locked(tmp_path, managers, job_release):
+    first, second, _ = managers
+    job = first.submit(upload(tmp_path), None, None)
+
+    assert second.get(job["job_id"])["status"] in ("queued", "running")
+    job_release.set()
+    wait_for(first, job["job_id"], {"completed"})
+
+def test_unknown_and_malformed_job_ids(managers):
+    first, _, _ = managers
+
+    assert first.get("0" * 32) is None
+    assert first.get("../../etc/passwd") is None
+
+def test_retrain_endpoint_returns_409_while_a_job_runs(tmp_path, managers, job_release, client,
+                                                       app_module, monkeypatch):
+    first, second, _ = managers
+    monkeypatch.setattr(app_module, "retrain_jobs", second)
+    job = first.submit(upload(tmp_path), None, None)
+
+    response = client.post("/retrain", files={"file": ("data.csv", b"MOI,temp,humidity,result\n", "text/csv")})
+    job_release.set()
+    status = client.get(f"/retrain/{job['job_id']}")
+
+    assert response.status_code == 409
+    assert job["job_id"] in response.json()["detail"]
+    assert status.status_code == 200
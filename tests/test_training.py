@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from src.training import NUMERICAL_FEATURES, fit_scaler_streaming, iter_scaled_batches
+
+N_ROWS = 1000
+CHUNK = 128
+
+@pytest.fixture(scope="module")
+def frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "crop ID": "Wheat",
+        "MOI": rng.uniform(0, 100, N_ROWS).round(1),
+        "temp": rng.uniform(10, 45, N_ROWS).round(1),
+        "humidity": rng.uniform(10, 90, N_ROWS).round(1),
+        "result": np.arange(N_ROWS) % 3,
+    })
+
+@pytest.fixture(scope="module")
+def csv_path(frame, tmp_path_factory):
+    path = tmp_path_factory.mktemp("training") / "data.csv"
+    frame.to_csv(path, index=False)
+    return str(path)
+
+@pytest.fixture(scope="module")
+def scaler(csv_path):
+    return fit_scaler_streaming(csv_path, chunksize=CHUNK)[0]
+
+def collect(csv_path, scaler, start, stop, **kwargs):
+    batches = list(iter_scaled_batches(csv_path, scaler, start, stop, batch_size=32, chunksize=CHUNK, **kwargs))
+    return batches, np.concatenate([X for X, _ in batches])
+
+def test_streaming_scaler_matches_full_fit(frame, csv_path):
+    scaler, n_rows = fit_scaler_streaming(csv_path, chunksize=CHUNK)
+
+    full = StandardScaler().fit(frame[NUMERICAL_FEATURES].to_numpy(np.float32).astype(np.float64))
+    assert n_rows == N_ROWS
+    np.testing.assert_allclose(scaler.mean_, full.mean_)
+    np.testing.assert_allclose(scaler.scale_, full.scale_)
+
+def test_batches_are_full_across_chunk_boundaries(frame, csv_path, scaler):
+    # 100..900 starts and stops inside chunks and spans several of them
+    batches, X = collect(csv_path, scaler, 100, 900)
+
+    assert [len(X) for X, _ in batches] == [32] * 25
+    expected = scaler.transform(frame[NUMERICAL_FEATURES].to_numpy(np.float32).astype(np.float64)[100:900])
+    np.testing.assert_allclose(X, expected, rtol=1e-6)
+    np.testing.assert_array_equal(np.concatenate([y for _, y in batches]), frame["result"][100:900] > 0)
+
+def test_last_batch_holds_the_remainder(csv_path, scaler):
+    batches, _ = collect(csv_path, scaler, 0, 810)
+
+    assert len(batches) == 26
+    assert [len(X) for X, _ in batches[:-1]] == [32] * 25
+    assert len(batches[-1][0]) == 10
+
+def test_train_and_validation_rows_split_the_file(csv_path, scaler):
+    n_train = int(N_ROWS * 0.8)
+    _, train = collect(csv_path, scaler, 0, n_train, rng=np.random.default_rng(0), shuffle_rows=CHUNK)
+    _, validation = collect(csv_path, scaler, n_train, N_ROWS)
+    _, everything = collect(csv_path, scaler, 0, N_ROWS)
+
+    rows = lambda X: sorted(map(tuple, X.tolist()))
+    assert len(train) == n_train and len(validation) == N_ROWS - n_train
+    assert rows(np.concatenate([train, validation])) == rows(everything)
+    np.testing.assert_array_equal(validation, everything[n_train:])
+
+def test_shuffle_mixes_chunks_and_changes_each_epoch(csv_path, scaler):
+    rng = np.random.default_rng(0)
+    positions = {tuple(row): i for i, row in enumerate(collect(csv_path, scaler, 0, N_ROWS)[1].tolist())}
+
+    first_batches, first = collect(csv_path, scaler, 0, N_ROWS, rng=rng, shuffle_rows=CHUNK)
+    _, second = collect(csv_path, scaler, 0, N_ROWS, rng=rng, shuffle_rows=CHUNK)
+
+    assert [len(X) for X, _ in first_batches[:-1]] == [32] * 31
+    chunks = [{positions[tuple(row)] // CHUNK for row in X.tolist()} for X, _ in first_batches]
+    assert any(len(c) > 1 for c in chunks)
+    # The first batch can already hold rows from past the first chunk
+    assert max(positions[tuple(row)] for row in first[:32].tolist()) >= CHUNK
+    assert not np.array_equal(first, second)